@@ -28,6 +28,7 @@ CREATE TABLE IF NOT EXISTS data_sources (
     headers           JSON            NULL     COMMENT 'Custom request headers',
     pagination        JSON            NULL     COMMENT 'Pagination config',
     field_mapping     JSON            NULL     COMMENT 'Field name mapping',
+    options           JSON            NULL     COMMENT 'Collection mode options',
     tags              JSON            NULL     COMMENT 'List of tags',
     notes             TEXT            NULL,
     rate_limit_rpm    INT             NOT NULL DEFAULT 60,
@@ -80,7 +81,7 @@ CREATE TABLE IF NOT EXISTS collection_runs (
     schedule_id       INT UNSIGNED    NULL,
     started_at        DATETIME        NOT NULL DEFAULT CURRENT_TIMESTAMP,
     completed_at      DATETIME        NULL,
-    status            VARCHAR(20)     NOT NULL COMMENT 'running | success | failed | partial | skipped',
+    status            VARCHAR(20)     NOT NULL COMMENT 'running | success | failed | partial | skipped | unchanged',
     records_fetched   INT             NOT NULL DEFAULT 0,
     records_stored    INT             NOT NULL DEFAULT 0,
     records_updated   INT             NOT NULL DEFAULT 0,
@@ -89,6 +90,7 @@ CREATE TABLE IF NOT EXISTS collection_runs (
     raw_file_path     VARCHAR(512)    NULL,
     duration_seconds  DOUBLE          NULL,
     triggered_by      VARCHAR(50)     NOT NULL DEFAULT 'scheduler' COMMENT 'scheduler | manual | api',
+    details           JSON            NULL     COMMENT 'Collector state: watermarks, etc.',
     PRIMARY KEY (id),
     KEY ix_source_id  (source_id),
     KEY ix_schedule_id(schedule_id),
@@ -170,6 +172,23 @@ CREATE TABLE IF NOT EXISTS collection_logs (
     CONSTRAINT fk_log_source FOREIGN KEY (source_id) REFERENCES data_sources   (id) ON DELETE SET NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
+-- ----------------------------------------------------------------
+-- http_validators
+-- ----------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS http_validators (
+    id             INT UNSIGNED    NOT NULL AUTO_INCREMENT,
+    source_id      INT UNSIGNED    NOT NULL,
+    url            VARCHAR(2048)   NOT NULL,
+    url_hash       CHAR(64)        NOT NULL COMMENT 'SHA-256 of url',
+    etag           VARCHAR(255)    NULL,
+    last_modified  VARCHAR(64)     NULL,
+    updated_at     DATETIME        NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (id),
+    UNIQUE KEY uq_http_validator_source_url (source_id, url_hash),
+    KEY ix_source_id (source_id),
+    CONSTRAINT fk_validator_source FOREIGN KEY (source_id) REFERENCES data_sources (id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
 -- ----------------------------------------------------------------
 -- app_settings
 -- ----------------------------------------------------------------
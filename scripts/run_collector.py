@@ -9,6 +9,12 @@
     python scripts/run_collector.py --all --state CO
     python scripts/run_collector.py --all --category dispensary
     python scripts/run_collector.py --list         # list all enabled sources
+    python scripts/run_collector.py --source co_med_licensees --full-refresh
+    python scripts/run_collector.py --source co_med_licensees --resume   # continue a failed run
+    python scripts/run_collector.py --all --check-updates  # which SODA datasets changed
+    python scripts/run_collector.py --source new_source --preview 10  # sample + field_mapping hints
+    python scripts/run_collector.py --replay 1234          # re-process a run's raw archive
+    python scripts/run_collector.py --source co_med_licensees --replay-history
 """
 import argparse
 import os
@@ -39,7 +45,100 @@ def list_sources(state=None, category=None, enabled_only=True):
         return [s.to_dict() for s in sources]
 
 
-def run_source(source_id_str: str, dry_run: bool = False):
+def archived_runs(source_id_str: str = None, run_ids=None):
+    """
+    Return (source_id, run_id) for runs with a raw archive, oldest first:
+    the given run IDs, or every archived run of a source.
+    """
+    from src.storage.database import session_scope
+    from src.storage.models import CollectionRun, DataSource
+
+    with session_scope() as session:
+        q = (
+            session.query(DataSource.source_id, CollectionRun.id)
+            .join(CollectionRun, CollectionRun.source_id == DataSource.id)
+            .filter(CollectionRun.raw_file_path.isnot(None))
+            .filter(CollectionRun.triggered_by != "replay")
+        )
+        if run_ids:
+            q = q.filter(CollectionRun.id.in_(run_ids))
+        if source_id_str:
+            q = q.filter(DataSource.source_id == source_id_str)
+        return [tuple(row) for row in q.order_by(CollectionRun.started_at).all()]
+
+
+def check_updates(source_ids):
+    """Print whether each SODA source's dataset changed since its last successful run."""
+    from concurrent.futures import ThreadPoolExecutor
+    from src.storage.database import session_scope
+    from src.storage.models import DataSource
+    from src.scheduler.manager import check_dataset_updates
+
+    with session_scope() as session:
+        rows = (
+            session.query(DataSource.id, DataSource.source_id)
+            .filter(DataSource.source_id.in_(source_ids), DataSource.format == "soda")
+            .all()
+        )
+    if not rows:
+        print("No SODA sources to check.")
+        return []
+    db_ids = [row.id for row in sorted(rows, key=lambda r: source_ids.index(r.source_id))]
+
+    print(f"\nChecking {len(db_ids)} SODA datasets for updates\n")
+    print(f"{'ID':<40} {'Status':<10} Rows updated (last run -> now)")
+    print("-" * 100)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(check_dataset_updates, db_ids))
+    for r in results:
+        before = (r["previous"] or {}).get("rows_updated_at")
+        now = (r["current"] or {}).get("rows_updated_at")
+        detail = r["error"] or f"{_fmt_epoch(before)} -> {_fmt_epoch(now)}"
+        print(f"{r['source_id']:<40} {r['status']:<10} {detail}")
+    changed = sum(1 for r in results if r["status"] == "changed")
+    unchanged = sum(1 for r in results if r["status"] == "unchanged")
+    print(f"\n  Changed: {changed} | Unchanged: {unchanged} | Unknown: {len(results) - changed - unchanged}")
+    return results
+
+
+def preview_sources(source_ids, n):
+    """Print the first records of each source and suggested field_mapping entries."""
+    import json
+    from src.storage.database import session_scope
+    from src.storage.models import DataSource
+    from src.scheduler.manager import preview_source
+
+    for sid in source_ids:
+        with session_scope() as session:
+            source = session.query(DataSource).filter_by(source_id=sid).first()
+            db_id = source.id if source else None
+        if db_id is None:
+            print(f"  [ERR] Source not found: {sid}")
+            continue
+        print(f"\n{'='*60}\nPreview: {sid}\n{'='*60}")
+        try:
+            result = preview_source(db_id, n)
+        except Exception as e:
+            print(f"[FAIL] {e}")
+            continue
+        print(f"{len(result['records'])} records in {result['seconds']:.1f}s, "
+              f"{len(result['columns'])} columns\n")
+        for record in result["records"]:
+            print(json.dumps(record, default=str, ensure_ascii=False)[:300])
+        print("\nSuggested field_mapping:")
+        print(json.dumps(result["suggested_mapping"], indent=2) if result["suggested_mapping"] else "  (none)")
+        if result["unmapped_columns"]:
+            print(f"\nUnmapped columns: {', '.join(result['unmapped_columns'])}")
+
+
+def _fmt_epoch(value):
+    if value is None:
+        return "-"
+    return datetime.utcfromtimestamp(int(value)).strftime("%Y-%m-%d %H:%M")
+
+
+def run_source(source_id_str: str, dry_run: bool = False, full_refresh: bool = False,
+               replay_run_id: int = None, resume: bool = False):
     """Run collection for a single source by source_id string."""
     from src.storage.database import session_scope
     from src.storage.models import DataSource
@@ -56,6 +155,8 @@ def run_source(source_id_str: str, dry_run: bool = False):
     print(f"Source: {source_dict['name']} ({source_id_str})")
     print(f"State:    {source_dict['state']} | Category: {source_dict['category']}")
     print(f"Format:   {source_dict['format']} | URL: {source_dict['url'][:80]}")
+    if replay_run_id:
+        print(f"Replay:   raw archive of run {replay_run_id} (no network)")
     print(f"{'='*60}")
 
     if dry_run:
@@ -67,10 +168,13 @@ def run_source(source_id_str: str, dry_run: bool = False):
         result = run_collection_job(
             source_db_id=source_dict["id"],
             triggered_by="cli",
+            full_refresh=full_refresh,
+            replay_run_id=replay_run_id,
+            resume=resume,
         )
         elapsed = time.time() - start
         status = result.get("status", "unknown")
-        icon = "[OK]" if status == "success" else "[FAIL]" if status == "failed" else "[WARN]"
+        icon = "[OK]" if status in ("success", "unchanged") else "[FAIL]" if status == "failed" else "[WARN]"
         print(f"\n{icon} Status: {status.upper()} ({elapsed:.1f}s)")
         print(f"  Fetched: {result.get('records_fetched', 0):,}")
         print(f"  Stored:  {result.get('records_stored', 0):,}")
@@ -96,13 +200,28 @@ def main():
                        help="Run all enabled sources")
     group.add_argument("--list", action="store_true",
                        help="List available sources and exit")
+    group.add_argument("--replay", nargs="+", type=int, metavar="RUN_ID",
+                       help="Re-process the raw archive of earlier run(s) without network")
 
     parser.add_argument("--state", help="Filter by state (with --all)")
     parser.add_argument("--category", help="Filter by category (with --all)")
     parser.add_argument("--dry-run", action="store_true",
                         help="List what would run without actually collecting")
+    parser.add_argument("--full-refresh", action="store_true",
+                        help="Ignore incremental watermarks and collect everything")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue each source's last failed run from its checkpoint")
+    parser.add_argument("--check-updates", action="store_true",
+                        help="With --source/--all: report which SODA datasets changed, without collecting")
+    parser.add_argument("--preview", nargs="?", type=int, const=20, metavar="N",
+                        help="With --source/--all: print the first N records (default 20) "
+                             "and suggested field_mapping, without storing anything")
+    parser.add_argument("--replay-history", action="store_true",
+                        help="With --source/--all: replay every archived run instead of collecting")
     parser.add_argument("--db-url", default=None)
     args = parser.parse_args()
+    if args.preview is not None and args.preview < 1:
+        parser.error("--preview N must be at least 1")
 
     db_url = args.db_url or os.environ.get(
         "DATABASE_URL", "sqlite:///data/cannabis_aggregator.db"
@@ -126,7 +245,12 @@ def main():
         return
 
     # Determine sources to run
-    if args.all:
+    if args.replay:
+        jobs = archived_runs(run_ids=args.replay)
+        missing = set(args.replay) - {run_id for _, run_id in jobs}
+        for run_id in sorted(missing):
+            print(f"  [ERR] Run {run_id} has no raw archive")
+    elif args.all:
         sources = list_sources(state=args.state, category=args.category)
         source_ids = [s["source_id"] for s in sources]
         print(f"\nRunning {len(source_ids)} sources" +
@@ -135,14 +259,29 @@ def main():
     else:
         source_ids = args.source
 
-    if not source_ids:
+    if args.check_updates and not args.replay:
+        check_updates(source_ids)
+        return
+
+    if args.preview is not None and not args.replay:
+        preview_sources(source_ids, args.preview)
+        return
+
+    if not args.replay:
+        if args.replay_history:
+            jobs = [job for sid in source_ids for job in archived_runs(sid)]
+        else:
+            jobs = [(sid, None) for sid in source_ids]
+
+    if not jobs:
         print("No sources to run.")
         return
 
     start_time = datetime.utcnow()
     results = []
-    for sid in source_ids:
-        result = run_source(sid, dry_run=args.dry_run)
+    for sid, replay_run_id in jobs:
+        result = run_source(sid, dry_run=args.dry_run, full_refresh=args.full_refresh,
+                            replay_run_id=replay_run_id, resume=args.resume)
         if result:
             results.append(result)
 
@@ -150,12 +289,13 @@ def main():
     elapsed_total = (datetime.utcnow() - start_time).total_seconds()
     success = sum(1 for r in results if r.get("status") == "success")
     failed  = sum(1 for r in results if r.get("status") == "failed")
+    unchanged = sum(1 for r in results if r.get("status") == "unchanged")
     total_fetched = sum(r.get("records_fetched", 0) for r in results)
     total_stored  = sum(r.get("records_stored", 0) for r in results)
 
     print(f"\n{'='*60}")
     print(f"SUMMARY - {len(results)} sources in {elapsed_total:.1f}s")
-    print(f"  Success: {success} | Failed: {failed}")
+    print(f"  Success: {success} | Unchanged: {unchanged} | Failed: {failed}")
     print(f"  Total fetched: {total_fetched:,} | Stored: {total_stored:,}")
     print(f"{'='*60}")
 
@@ -57,6 +57,7 @@ def seed_sources(session, sources_cfg: list, force: bool = False, dry_run: bool
             "params":       cfg.get("params", {}),
             "pagination":   cfg.get("pagination", {}),
             "field_mapping": cfg.get("field_mapping", {}),
+            "options":      cfg.get("options", {}),
             "headers":      cfg.get("headers", {}),
             "rate_limit_rpm": cfg.get("rate_limit_rpm", 60),
         }
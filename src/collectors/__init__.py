@@ -2,12 +2,21 @@
 from .api_collector import APICollector, SODACollector
 from .csv_collector import CSVCollector
 from .geojson_collector import GeoJSONCollector
+from .xml_collector import XMLCollector
+from .jsonl_collector import JSONLCollector
+from .zip_collector import ZipCSVCollector
+from .xlsx_collector import XLSXCollector
 
 COLLECTOR_MAP = {
     "json": APICollector,
     "soda": SODACollector,
     "csv": CSVCollector,
     "geojson": GeoJSONCollector,
+    "xml": XMLCollector,
+    "jsonl": JSONLCollector,
+    "ndjson": JSONLCollector,
+    "zip": ZipCSVCollector,
+    "xlsx": XLSXCollector,
     "api": APICollector,
 }
 
@@ -1,10 +1,17 @@
 """
 Collectors for JSON REST APIs and Socrata SODA APIs.
 """
+import hashlib
+import json
 import logging
-from typing import Generator, Dict, Any, Optional, List
+import re
+from datetime import datetime, timedelta
+from typing import Generator, Dict, Any, Optional, List, Set, Tuple
+from urllib.parse import urlsplit
 
-from .base import BaseCollector, CollectionError
+from src.processors.normalizer import RecordNormalizer
+from .base import BaseCollector, CollectionError, SourceUnchanged
+from .json_stream import JSONRecordStream, RECORD_WRAPPER_KEYS
 
 logger = logging.getLogger(__name__)
 
@@ -36,16 +43,56 @@ def collect(self) -> Generator[Dict[str, Any], None, None]:
         else:
             yield from self._fetch_all_no_pagination(url, params)
 
+    def _preview_records(self, n: int) -> Generator[Dict[str, Any], None, None]:
+        """
+        Stream the first page only, with the page size set to ``n`` where
+        the pagination style has a size parameter.
+        """
+        params = dict(self._get_initial_params() or {})
+        pagination = self._get_pagination_config() or {}
+        pag_type = (pagination.get("type") or "none").lower()
+        if pag_type == "offset":
+            params[pagination.get("limit_param", "limit")] = n
+            params[pagination.get("offset_param", "offset")] = 0
+        elif pag_type == "page":
+            params[pagination.get("size_param", "per_page")] = n
+            params[pagination.get("page_param", "page")] = pagination.get("start_page", 1)
+        elif pag_type == "cursor":
+            params[pagination.get("size_param", "limit")] = n
+        yield from self._stream_json_records(self._get_url(), params)
+
+    def _volatile_params(self) -> Tuple[str, ...]:
+        """Cursor tokens are issued by the server and differ between runs."""
+        pagination = self._get_pagination_config() or {}
+        if (pagination.get("type") or "").lower() == "cursor":
+            return (pagination.get("cursor_param", "cursor"),)
+        return ()
+
     def _fetch_all_no_pagination(
         self, url: str, params: dict
     ) -> Generator[Dict[str, Any], None, None]:
         """Fetch entire response as single request."""
+        if self._stream_json():
+            yield from self._stream_json_records(url, params)
+            return
+
+        skip = self._resume_point("single").get("skip", 0)
         resp = self.fetch_url(url, params=params or None)
         data = self._parse_json_response(resp)
         records = self._extract_records(data)
-        for record in records:
-            self._collected_count += 1
-            yield record
+        yield from self._checkpoint_records(records, {"type": "single"}, skip)
+
+    def _stream_json_records(
+        self, url: str, params: dict
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Stream records out of a single large JSON response."""
+        skip = self._resume_point("single").get("skip", 0)
+        resp = self.fetch_url(url, params=params or None, stream=True)
+        try:
+            stream = JSONRecordStream(resp.iter_content(chunk_size=self.JSON_CHUNK_SIZE))
+            yield from self._checkpoint_records(stream, {"type": "single"}, skip)
+        finally:
+            resp.close()
 
     def _fetch_offset_paginated(
         self, url: str, params: dict, pagination: dict
@@ -57,7 +104,29 @@ def _fetch_offset_paginated(
 
         params = dict(params or {})
         params[limit_param] = page_size
-        offset = 0
+        resume = self._resume_point("offset")
+        offset = int(resume.get("offset", 0))
+        skip = resume.get("skip", 0)
+
+        max_parallel = self._get_max_parallel_pages()
+        total = self.get_count() if max_parallel > 1 else None
+        if total is not None:
+            def fetch_offset(page_offset: int) -> List[Dict]:
+                page_params = dict(params)
+                page_params[offset_param] = page_offset
+                resp = self.fetch_url(url, params=page_params)
+                return self._extract_records(self._parse_json_response(resp))
+
+            offsets = range(offset, int(total), page_size)
+            records = yield from self._yield_parallel_pages(
+                fetch_offset, offsets, max_parallel, "offset", skip
+            )
+            if records is not None and len(records) < page_size:
+                return
+            # Count may have grown since it was taken: continue serially
+            offset += len(offsets) * page_size
+            if offsets:
+                skip = 0
 
         while True:
             params[offset_param] = offset
@@ -68,9 +137,10 @@ def _fetch_offset_paginated(
             if not records:
                 break
 
-            for record in records:
-                self._collected_count += 1
-                yield record
+            yield from self._checkpoint_records(
+                records, {"type": "offset", "offset": offset}, skip
+            )
+            skip = 0
 
             if len(records) < page_size:
                 break  # Last page
@@ -90,7 +160,30 @@ def _fetch_page_paginated(
 
         params = dict(params or {})
         params[size_param] = page_size
-        page = pagination.get("start_page", 1)
+        resume = self._resume_point("page")
+        page = int(resume.get("page", pagination.get("start_page", 1)))
+        skip = resume.get("skip", 0)
+
+        max_parallel = self._get_max_parallel_pages()
+        total = self.get_count() if max_parallel > 1 else None
+        if total is not None:
+            def fetch_page(page_number: int) -> List[Dict]:
+                page_params = dict(params)
+                page_params[page_param] = page_number
+                resp = self.fetch_url(url, params=page_params)
+                return self._extract_records(self._parse_json_response(resp))
+
+            start_page = int(pagination.get("start_page", 1))
+            page_count = -(-int(total) // page_size) - (page - start_page)
+            pages = range(page, page + max(0, page_count))
+            records = yield from self._yield_parallel_pages(
+                fetch_page, pages, max_parallel, "page", skip
+            )
+            if records is not None and len(records) < page_size:
+                return
+            page += len(pages)
+            if pages:
+                skip = 0
 
         while True:
             params[page_param] = page
@@ -101,9 +194,8 @@ def _fetch_page_paginated(
             if not records:
                 break
 
-            for record in records:
-                self._collected_count += 1
-                yield record
+            yield from self._checkpoint_records(records, {"type": "page", "page": page}, skip)
+            skip = 0
 
             if len(records) < page_size:
                 break
@@ -121,7 +213,9 @@ def _fetch_cursor_paginated(
 
         params = dict(params or {})
         params[size_param] = page_size
-        cursor = None
+        resume = self._resume_point("cursor")
+        cursor = resume.get("cursor")
+        skip = resume.get("skip", 0)
 
         while True:
             if cursor:
@@ -131,9 +225,10 @@ def _fetch_cursor_paginated(
             data = self._parse_json_response(resp)
             records = self._extract_records(data)
 
-            for record in records:
-                self._collected_count += 1
-                yield record
+            yield from self._checkpoint_records(
+                records, {"type": "cursor", "cursor": cursor}, skip
+            )
+            skip = 0
 
             # Get next cursor from response metadata
             cursor = self._nested_get(data, cursor_field)
@@ -144,23 +239,53 @@ def _fetch_link_paginated(
         self, url: str, params: dict, pagination: dict
     ) -> Generator[Dict[str, Any], None, None]:
         """Fetch following Link: <next> HTTP headers."""
-        next_url = url
+        resume = self._resume_point("link")
+        next_url = resume.get("next_url") or url
+        skip = resume.get("skip", 0)
+        if next_url != url:
+            params = None  # Resuming mid-way: params are embedded in next_url
 
         while next_url:
-            resp = self.fetch_url(next_url, params=params)
+            page_url = next_url
+            resp = self.fetch_url(page_url, params=params)
             params = None  # Params are embedded in next_url after first request
 
             data = self._parse_json_response(resp)
             records = self._extract_records(data)
 
-            for record in records:
-                self._collected_count += 1
-                yield record
+            yield from self._checkpoint_records(
+                records, {"type": "link", "next_url": page_url}, skip
+            )
+            skip = 0
 
             # Parse Link header for next page
             link_header = resp.headers.get("Link", "")
             next_url = self._parse_link_next(link_header)
 
+    def _yield_parallel_pages(
+        self, fetch_page, page_keys, max_parallel: int, kind: str, skip: int = 0
+    ) -> Generator[Dict[str, Any], None, Optional[List[Dict]]]:
+        """
+        Fetch the given pages concurrently and yield their records in page
+        order, checkpointing as ``{"type": kind, kind: page_key}``. Returns
+        the last page's records (None if there were no pages) so callers can
+        tell whether more rows may follow.
+        """
+        self.logger.debug(
+            f"Parallel pagination: {len(page_keys)} pages, {max_parallel} workers"
+        )
+        last = None
+        pages = self._iter_parallel(fetch_page, page_keys, max_parallel)
+        for page_key, records in zip(page_keys, pages):
+            yield from self._checkpoint_records(
+                records, {"type": kind, kind: page_key}, skip
+            )
+            skip = 0
+            last = records
+            if not records:
+                break
+        return last
+
     # ------------------------------------------------------------------
     # Response parsing helpers
     # ------------------------------------------------------------------
@@ -178,7 +303,7 @@ def _extract_records(self, data) -> List[Dict]:
 
         if isinstance(data, dict):
             # Common wrapper patterns
-            for key in ("data", "results", "records", "items", "features", "hits"):
+            for key in RECORD_WRAPPER_KEYS:
                 if key in data and isinstance(data[key], list):
                     return data[key]
             # Try 'hits.hits' (Elasticsearch style)
@@ -243,42 +368,127 @@ class SODACollector(APICollector):
     """
 
     SODA_LIMIT = 5000  # Socrata max per request
+    DEFAULT_WATERMARK_COLUMN = ":updated_at"
+
+    def __init__(self, source):
+        super().__init__(source)
+        # System fields selected only for paging or the watermark, dropped
+        # from the records again
+        self._hidden_fields: Set[str] = set()
+        # Incremental column and the highest value of it seen this run
+        self._watermark_column: Optional[str] = None
+        self._watermark_value: Optional[str] = None
+        # Views API document, loaded once (None if unavailable)
+        self._view_metadata: Optional[Dict[str, Any]] = None
+        self._view_metadata_loaded = False
 
     def collect(self) -> Generator[Dict[str, Any], None, None]:
-        """Yield records from SODA API with offset pagination."""
+        """Yield records from SODA API with keyset or offset pagination."""
         url = self._get_url()
         params = dict(self._get_initial_params() or {})
         pagination = self._get_pagination_config() or {}
         page_size = int(pagination.get("page_size", self.SODA_LIMIT))
 
         params["$limit"] = page_size
-        offset = 0
+
+        if self._use_conditional_requests():
+            self._check_dataset_unchanged()
+
+        aggregate = self._get_options().get("aggregate")
+        if aggregate:
+            yield from self._collect_offset(
+                url, self._apply_aggregate(params, aggregate), page_size, parallel=False
+            )
+            return
+
+        incremental = self._get_incremental_config()
+        projection = self._get_options().get("projection")
+        if projection:
+            params = self._apply_projection(
+                params, projection if isinstance(projection, dict) else {}, incremental
+            )
+        if incremental is not None:
+            params = self._apply_incremental(params, incremental)
+            resumed = (self.resume_from or {}).get("watermark_value")
+            if resumed and (self._watermark_value is None or resumed > self._watermark_value):
+                # Rows stored by the interrupted run still count toward the mark
+                self._watermark_value = resumed
+
+        try:
+            if (pagination.get("type") or "").lower() == "keyset":
+                completed = yield from self._collect_keyset(url, params, page_size)
+                if completed:
+                    return
+                self.logger.warning(
+                    "Keyset pagination not supported by this dataset; "
+                    "falling back to $offset paging"
+                )
+
+            yield from self._collect_offset(url, params, page_size)
+        finally:
+            self._record_watermark()
+
+    def _volatile_params(self) -> Tuple[str, ...]:
+        """The watermark and the keyset cursor are both part of $where."""
+        pagination = self._get_pagination_config() or {}
+        if (self._get_incremental_config() is not None
+                or (pagination.get("type") or "").lower() == "keyset"):
+            return ("$where",)
+        return ()
+
+    def _preview_records(self, n: int) -> Generator[Dict[str, Any], None, None]:
+        """One $limit=n request; aggregate sources preview their rollup rows."""
+        params = dict(self._get_initial_params() or {})
+        params.pop("$offset", None)
+        aggregate = self._get_options().get("aggregate")
+        if aggregate:
+            params = self._apply_aggregate(params, aggregate)
+        params["$limit"] = n
+        yield from self._parse_soda_page(self.fetch_url(self._get_url(), params=params))
+
+    def _collect_offset(
+        self, url: str, params: dict, page_size: int, parallel: bool = True
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Page through a dataset with an increasing $offset."""
+        params = dict(params)
+        resume = self._resume_point("offset")
+        offset = int(resume.get("offset", 0))
+        skip = resume.get("skip", 0)
+
+        max_parallel = self._get_max_parallel_pages() if parallel else 1
+        total = self.get_count(params) if max_parallel > 1 else None
+        if total is not None:
+            # Offsets fetched out of order need a stable sort to line up
+            params.setdefault("$order", ":id")
+
+            def fetch_offset(page_offset: int) -> List[Dict]:
+                page_params = dict(params)
+                page_params["$offset"] = page_offset
+                return self._parse_soda_page(self.fetch_url(url, params=page_params))
+
+            offsets = range(offset, total, page_size)
+            records = yield from self._yield_parallel_pages(
+                fetch_offset, offsets, max_parallel, "offset", skip
+            )
+            if records is not None and len(records) < page_size:
+                return
+            # Rows added since the count was taken are paged serially
+            offset += len(offsets) * page_size
+            if offsets:
+                skip = 0
 
         while True:
             params["$offset"] = offset
             resp = self.fetch_url(url, params=params)
-
-            try:
-                records = resp.json()
-            except ValueError:
-                # Some Socrata portals return a UTF-8 BOM; strip it and retry
-                try:
-                    import json as _json
-                    records = _json.loads(resp.content.decode("utf-8-sig"))
-                except Exception as e:
-                    raise CollectionError(f"SODA JSON parse error: {e}")
-
-            if not isinstance(records, list):
-                raise CollectionError(
-                    f"Unexpected SODA response type: {type(records)}"
-                )
+            records = self._parse_soda_page(resp)
 
             if not records:
                 break
 
-            for record in records:
-                self._collected_count += 1
-                yield record
+            yield from self._checkpoint_records(
+                records, {"type": "offset", "offset": offset}, skip
+            )
+            skip = 0
 
             if len(records) < page_size:
                 break  # Last page
@@ -286,14 +496,375 @@ def collect(self) -> Generator[Dict[str, Any], None, None]:
             offset += page_size
             self.logger.debug(f"SODA pagination: offset={offset} total={self._collected_count}")
 
-    def get_count(self) -> Optional[int]:
-        """Get total count using SODA $count=true endpoint."""
+    def _collect_keyset(
+        self, url: str, params: dict, page_size: int
+    ) -> Generator[Dict[str, Any], None, bool]:
+        """
+        Page through a dataset ordered by the system :id field, asking for
+        rows with :id greater than the last one seen. Unlike $offset, the
+        server cost per page stays flat and rows cannot shift between pages.
+
+        Returns False (before yielding anything) if the dataset rejects
+        :id ordering, so the caller can fall back to offset paging.
+        """
+        params = dict(params)
+        user_where = params.pop("$where", None)
+        hidden_before = set(self._hidden_fields)
+
+        if params.get("$order") and params["$order"] != ":id":
+            self.logger.warning(
+                f"Keyset pagination overrides $order={params['$order']!r} with :id"
+            )
+        params["$order"] = ":id"
+        params.pop("$offset", None)
+        self._select_system_field(params, ":id")
+
+        last_id = self._resume_point("keyset").get("last_id")
+        while True:
+            params["$where"] = combine_where(
+                user_where, f":id > '{_soql_escape(last_id)}'" if last_id else None
+            )
+            if not params["$where"]:
+                params.pop("$where")
+
+            try:
+                records = self._parse_soda_page(self.fetch_url(url, params=params))
+            except CollectionError as e:
+                if last_id is None:
+                    self.logger.debug(f"Keyset probe failed: {e}")
+                    self._hidden_fields = hidden_before
+                    return False
+                raise
+
+            if records and ":id" not in records[-1]:
+                if last_id is None:
+                    self._hidden_fields = hidden_before
+                    return False
+                raise CollectionError("SODA keyset page is missing the :id field")
+
+            for record in records:
+                last_id = record.get(":id", last_id)
+                self._collected_count += 1
+                self.checkpoint = {"type": "keyset", "last_id": last_id}
+                yield self._finish_record(record)
+
+            if len(records) < page_size:
+                return True  # Last page
+
+            self.logger.debug(f"SODA keyset: after={last_id} total={self._collected_count}")
+
+    # ------------------------------------------------------------------
+    # Change detection
+    # ------------------------------------------------------------------
+
+    def get_dataset_version(self) -> Optional[Dict[str, Any]]:
+        """The dataset's rowsUpdatedAt / dataUpdatedAt from the views API."""
+        meta = self._dataset_metadata()
+        if not meta:
+            return None
+        version = {
+            "rows_updated_at": meta.get("rowsUpdatedAt"),
+            "data_updated_at": meta.get("dataUpdatedAt"),
+        }
+        return version if any(v is not None for v in version.values()) else None
+
+    def get_config_fingerprint(self) -> str:
+        """
+        Hash of the source config that decides which rows a run stores:
+        URL, params, field_mapping and the aggregate / projection /
+        incremental options. Saved next to the dataset version so an
+        edited source is collected even when the dataset is not updated.
+        """
+        options = self._get_options()
+        config = {
+            "url": getattr(self.source, "url", None),
+            "params": self._get_initial_params(),
+            "field_mapping": getattr(self.source, "field_mapping", None) or {},
+            "aggregate": options.get("aggregate"),
+            "projection": options.get("projection"),
+            "incremental": options.get("incremental"),
+        }
+        canonical = json.dumps(config, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _check_dataset_unchanged(self) -> None:
+        """
+        Raise SourceUnchanged if the dataset has not been updated and the
+        source config has not changed since the last successful run. Both
+        are saved on every run.
+        """
+        version = self.get_dataset_version()
+        if version is None:
+            return
+        fingerprint = self.get_config_fingerprint()
+        self.run_details["dataset_version"] = version
+        self.run_details["config_fingerprint"] = fingerprint
+        if self.resume_from:
+            return  # An interrupted run still has rows to fetch
+        if fingerprint != self.previous_state.get("config_fingerprint"):
+            self.logger.info("Source config changed since last run; collecting")
+            return
+        if version == self.previous_state.get("dataset_version"):
+            raise SourceUnchanged(
+                f"Dataset not updated since last run (rowsUpdatedAt={version['rows_updated_at']})"
+            )
+
+    # ------------------------------------------------------------------
+    # Server-side aggregation
+    # ------------------------------------------------------------------
+
+    def _apply_aggregate(self, params: dict, aggregate: dict) -> dict:
+        """
+        Turn the query into a rollup (options.aggregate): one row per
+        ``group_by`` combination with a column per ``measures`` expression.
+
+            aggregate:
+              group_by: [year, month]          # or {alias: SoQL expression}
+              measures: {med_sales: "sum(med_sales)"}
+              having: "sum(rec_sales) > 0"     # optional
+
+        Rows are paged in group order so $offset stays stable. Incremental,
+        projection and keyset settings do not apply to rollups.
+        """
+        group_by = aggregate.get("group_by") or []
+        if isinstance(group_by, str):
+            group_by = [group_by]
+        if not isinstance(group_by, dict):
+            group_by = {column: column for column in group_by}
+        measures = aggregate.get("measures") or {}
+        if not measures or not isinstance(measures, dict):
+            raise CollectionError("options.aggregate needs a measures mapping")
+
+        select = [
+            expr if alias == expr else f"{expr} AS {alias}"
+            for alias, expr in group_by.items()
+        ]
+        select += [f"{expr} AS {alias}" for alias, expr in measures.items()]
+
+        params = dict(params)
+        params.pop("$offset", None)
+        params["$select"] = ", ".join(select)
+        if group_by:
+            params["$group"] = ", ".join(group_by.values())
+            # Order by every group column so $offset paging is stable
+            order = _split_select(params["$order"]) if params.get("$order") else []
+            ordered = {part.split()[0] for part in order if part}
+            order += [expr for expr in group_by.values() if expr not in ordered]
+            params["$order"] = ", ".join(order)
+        if aggregate.get("having"):
+            params["$having"] = aggregate["having"]
+        if self._get_incremental_config() is not None:
+            self.logger.warning("Incremental collection does not apply to aggregate mode")
+
+        self.run_details["aggregate"] = {
+            "select": params["$select"], "group": params.get("$group"),
+        }
+        self.logger.info(f"Aggregate mode: $select={params['$select']} $group={params.get('$group')}")
+        return params
+
+    # ------------------------------------------------------------------
+    # Column projection
+    # ------------------------------------------------------------------
+
+    def _dataset_metadata(self) -> Optional[Dict[str, Any]]:
+        """The dataset's Socrata views API document (None if unavailable)."""
+        if self._view_metadata_loaded:
+            return self._view_metadata
+        self._view_metadata_loaded = True
+        views_url = _views_url(self._get_url())
+        if views_url:
+            try:
+                meta = self.fetch_url(views_url).json()
+                if isinstance(meta, dict):
+                    self._view_metadata = meta
+            except (CollectionError, ValueError) as e:
+                self.logger.debug(f"Could not load dataset metadata: {e}")
+        return self._view_metadata
+
+    def _apply_projection(
+        self, params: dict, projection: dict, incremental: Optional[dict] = None
+    ) -> dict:
+        """
+        Ask only for the columns the normalizer uses (options.projection):
+        field_mapping sources, coordinate columns, columns matching unmapped
+        standard fields, the incremental watermark column and any
+        ``keep`` columns. Pruned columns are listed on the run.
+        """
+        if params.get("$select"):
+            self.logger.info("Projection skipped: the source sets its own $select")
+            return params
+        meta = self._dataset_metadata() or {}
+        columns = [
+            c for c in meta.get("columns") or []
+            if c.get("fieldName") and not c["fieldName"].startswith(":")
+        ]
+        if not columns:
+            self.logger.warning("Projection skipped: dataset columns unavailable")
+            return params
+
+        mapping = getattr(self.source, "field_mapping", None) or {}
+        wanted = {str(v).split(".")[0] for v in mapping.values() if v}
+        wanted.update(projection.get("keep") or [])
+        if incremental and not str(incremental.get("column") or ":").startswith(":"):
+            wanted.add(incremental["column"])
+
+        auto = RecordNormalizer(self.source).candidate_columns()
+
+        names = [c["fieldName"] for c in columns]
+        missing = sorted(wanted - set(names))
+        if missing:
+            self.logger.warning(f"Projection: columns not in dataset: {', '.join(missing)}")
+        selected = [
+            c["fieldName"] for c in columns
+            if c["fieldName"] in wanted or c["fieldName"] in auto
+            or c.get("dataTypeName") in ("point", "location")
+        ]
+        pruned = [name for name in names if name not in selected]
+        if not pruned or not selected:
+            return params
+
+        params = dict(params)
+        params["$select"] = ", ".join(selected)
+        self.run_details["projection"] = {"selected": selected, "pruned": pruned}
+        self.logger.info(
+            f"Projection: requesting {len(selected)} of {len(names)} columns"
+        )
+        return params
+
+    # ------------------------------------------------------------------
+    # Incremental (watermark) collection
+    # ------------------------------------------------------------------
+
+    def _get_incremental_config(self) -> Optional[Dict[str, Any]]:
+        """Get the incremental options, or None when incremental is off."""
+        incremental = self._get_options().get("incremental")
+        if not incremental:
+            return None
+        return incremental if isinstance(incremental, dict) else {}
+
+    def _apply_incremental(self, params: dict, incremental: dict) -> dict:
+        """
+        Restrict the query to rows changed since the previous run's
+        high-water mark, unless a full refresh is due.
+        """
+        params = dict(params)
+        column = incremental.get("column") or self.DEFAULT_WATERMARK_COLUMN
+        self._watermark_column = column
+        if column.startswith(":"):
+            self._select_system_field(params, column)
+
+        previous = self.previous_state.get("watermark") or {}
+        since = previous.get("value") if previous.get("column") == column else None
+        self._watermark_value = since
+
+        if self._full_refresh_due(incremental) or not since:
+            self.run_details["full_refresh_at"] = datetime.utcnow().isoformat()
+            self.logger.info(f"Incremental source: full refresh (watermark={since})")
+            return params
+
+        self.run_details["full_refresh_at"] = self.previous_state.get("full_refresh_at")
+        params["$where"] = combine_where(
+            params.get("$where"), f"{column} > '{_soql_escape(since)}'"
+        )
+        self.logger.info(f"Incremental source: fetching rows with {column} > {since}")
+        return params
+
+    def _full_refresh_due(self, incremental: dict) -> bool:
+        """True if a full refresh was forced or the refresh interval elapsed."""
+        if self.full_refresh:
+            return True
+        days = incremental.get("full_refresh_days")
+        if not days:
+            return False
+        last_full = self.previous_state.get("full_refresh_at")
+        if not last_full:
+            return True
+        try:
+            elapsed = datetime.utcnow() - datetime.fromisoformat(last_full)
+        except (TypeError, ValueError):
+            return True
+        return elapsed >= timedelta(days=float(days))
+
+    def _record_watermark(self) -> None:
+        """Store the highest watermark value seen for the next run."""
+        if self._watermark_column and self._watermark_value:
+            self.run_details["watermark"] = {
+                "column": self._watermark_column,
+                "value": self._watermark_value,
+            }
+
+    # ------------------------------------------------------------------
+    # Record helpers
+    # ------------------------------------------------------------------
+
+    def _select_system_field(self, params: dict, field: str) -> None:
+        """
+        Ask Socrata to return a system field (e.g. :id) alongside the row.
+        Fields the user did not select themselves are stripped from records.
+        """
+        select = params.get("$select")
+        if not select:
+            params["$select"] = f"{field}, *"
+        elif field in _split_select(select):
+            return
+        else:
+            params["$select"] = f"{select}, {field}"
+        self._hidden_fields.add(field)
+
+    def _checkpoint_records(
+        self, records, position: Dict[str, Any], skip: int = 0
+    ) -> Generator[Dict[str, Any], None, None]:
+        for record in super()._checkpoint_records(records, position, skip):
+            yield self._finish_record(record)
+
+    def get_checkpoint(self) -> Dict[str, Any]:
+        checkpoint = super().get_checkpoint()
+        if checkpoint and self._watermark_value:
+            checkpoint["watermark_value"] = self._watermark_value
+        return checkpoint
+
+    def _finish_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Track the watermark and drop system fields added for paging."""
+        if self._watermark_column:
+            value = record.get(self._watermark_column)
+            if value is not None and (
+                self._watermark_value is None or str(value) > self._watermark_value
+            ):
+                self._watermark_value = str(value)
+        if self._hidden_fields:
+            return {k: v for k, v in record.items() if k not in self._hidden_fields}
+        return record
+
+    def _parse_soda_page(self, resp) -> List[Dict[str, Any]]:
+        """Decode one page of SODA results (a JSON array of row objects)."""
+        try:
+            records = resp.json()
+        except ValueError:
+            # Some Socrata portals return a UTF-8 BOM; strip it and retry
+            try:
+                import json as _json
+                records = _json.loads(resp.content.decode("utf-8-sig"))
+            except Exception as e:
+                raise CollectionError(f"SODA JSON parse error: {e}")
+
+        if not isinstance(records, list):
+            raise CollectionError(
+                f"Unexpected SODA response type: {type(records)}"
+            )
+        return records
+
+    def get_count(self, params: Optional[Dict[str, Any]] = None) -> Optional[int]:
+        """
+        Get total count using a SODA count(*) query.
+        Pass the effective query params to count a filtered result set.
+        """
         try:
             url = self._get_url()
-            params = dict(self._get_initial_params() or {})
+            params = dict(params if params is not None else self._get_initial_params() or {})
             params["$select"] = "count(*) AS count"
             params["$limit"] = 1
             params.pop("$offset", None)
+            params.pop("$order", None)
 
             resp = self.fetch_url(url, params=params)
             data = resp.json()
@@ -313,10 +884,12 @@ def query(
         order: str = None,
         limit: int = None,
         offset: int = None,
+        group: str = None,
+        having: str = None,
     ) -> Generator[Dict[str, Any], None, None]:
         """
         Execute a SoQL query against this SODA source.
-        Allows filtering, selecting, and ordering.
+        Allows filtering, selecting, grouping, and ordering.
         """
         url = self._get_url()
         params = {}
@@ -324,6 +897,10 @@ def query(
             params["$where"] = where
         if select:
             params["$select"] = select
+        if group:
+            params["$group"] = group
+        if having:
+            params["$having"] = having
         if order:
             params["$order"] = order
         if limit:
@@ -335,3 +912,32 @@ def query(
         records = resp.json()
         for record in (records if isinstance(records, list) else []):
             yield record
+
+
+def combine_where(*clauses: Optional[str]) -> Optional[str]:
+    """AND together SoQL $where clauses, skipping empty ones."""
+    parts = [c.strip() for c in clauses if c and c.strip()]
+    if not parts:
+        return None
+    if len(parts) == 1:
+        return parts[0]
+    return " AND ".join(f"({p})" for p in parts)
+
+
+def _soql_escape(value: str) -> str:
+    """Escape a value for use inside a single-quoted SoQL string literal."""
+    return str(value).replace("'", "''")
+
+
+def _views_url(resource_url: str) -> Optional[str]:
+    """Map a /resource/<id>.json SODA endpoint to its /api/views/<id>.json."""
+    match = re.search(r"/resource/([a-z0-9]{4}-[a-z0-9]{4})", resource_url or "")
+    if not match:
+        return None
+    parts = urlsplit(resource_url)
+    return f"{parts.scheme}://{parts.netloc}/api/views/{match.group(1)}.json"
+
+
+def _split_select(select: str) -> List[str]:
+    """Split a SoQL $select list into its (stripped) column expressions."""
+    return [part.strip() for part in select.split(",")]
@@ -1,21 +1,45 @@
 """
 Base collector class defining the interface all collectors must implement.
 """
+import itertools
 import logging
 import os
+import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Generator, Optional, Dict, Any, List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Generator, Optional, Dict, Any, List, Callable, Iterable, Tuple
+from urllib.parse import urlencode
 
 import requests
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from src.processors.normalizer import RecordNormalizer
+from .rate_limiter import TokenBucket, get_rate_limiter, parse_retry_after
+from .session_pool import get_session_registry
+
 logger = logging.getLogger(__name__)
 
 
 class CollectionError(Exception):
-    """Raised when a collection fails fatally."""
+    """
+    Raised when a collection fails fatally. ``status_code`` is the HTTP
+    status of the failed response, if there was one.
+    """
+
+    def __init__(self, message: str = "", status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class RequestTimeout(CollectionError):
+    """Raised when a request gets no response within the source timeout."""
+    pass
+
+
+class SourceUnchanged(Exception):
+    """Raised when the source reports nothing changed since the last run."""
     pass
 
 
@@ -27,7 +51,12 @@ class BaseCollector(ABC):
 
     DEFAULT_TIMEOUT = int(os.environ.get("REQUEST_TIMEOUT", 60))
     DEFAULT_MAX_RETRIES = int(os.environ.get("MAX_RETRIES", 3))
-    DEFAULT_RETRY_DELAY = int(os.environ.get("RETRY_DELAY", 5))
+    DEFAULT_RETRY_DELAY = int(os.environ.get("RETRY_DELAY", 5))      # Backoff cap (s)
+    RETRY_BACKOFF = float(os.environ.get("RETRY_BACKOFF", 0.5))       # First backoff (s)
+    MAX_RETRY_AFTER = int(os.environ.get("MAX_RETRY_AFTER", 300))     # Longest Retry-After honored
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    JSON_CHUNK_SIZE = 64 * 1024  # Bytes per read when streaming JSON bodies
+    PREVIEW_RECORDS = 20         # Default number of records fetched by preview()
     USER_AGENT = os.environ.get(
         "USER_AGENT",
         "CannabisDataAggregator/1.0 (Open Data Collector)"
@@ -43,7 +72,30 @@ def __init__(self, source):
         self.logger = logging.getLogger(f"{__name__}.{self.source_id}")
         self._session: Optional[requests.Session] = None
         self._collected_count = 0
-        self._last_request_time = 0.0
+        self._rate_lock = threading.Lock()
+        self._source_bucket: Optional[TokenBucket] = None
+        self._rate_wait = 0.0
+        # State saved on the last successful CollectionRun (set by the job
+        # runner) and the state this run wants persisted on its own run.
+        self.previous_state: Dict[str, Any] = {}
+        self.run_details: Dict[str, Any] = {}
+        # Ignore incremental state and re-collect everything
+        self.full_refresh = False
+        # HTTP validators keyed by request URL: loaded from the last run
+        # (validators) and captured from this run's responses (new_validators)
+        self.validators: Dict[str, Dict[str, Optional[str]]] = {}
+        self.new_validators: Dict[str, Dict[str, Optional[str]]] = {}
+        # Raw-response archive to record this run into (RawArchiveWriter), or
+        # an archive to serve responses from instead of the network
+        # (RawArchiveReader); both are set by the job runner
+        self.archive = None
+        self.replay = None
+        # Position just after the last yielded record, and the checkpoint of
+        # an interrupted run to continue from (set by the job runner)
+        self.checkpoint: Dict[str, Any] = {}
+        self.resume_from: Dict[str, Any] = {}
+        # Record count of a preview() in progress (None during collection)
+        self.preview_limit: Optional[int] = None
 
     # ------------------------------------------------------------------
     # Abstract interface
@@ -83,51 +135,94 @@ def get_count(self) -> Optional[int]:
         """
         return None
 
+    def preview(self, n: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Fetch the first ``n`` records the cheapest way the format allows and
+        suggest field_mapping entries for their columns. Meant for onboarding
+        a new source: nothing is archived, checkpointed or revalidated.
+        """
+        n = max(1, int(n or self.PREVIEW_RECORDS))
+        started = time.monotonic()
+        self.preview_limit = n
+        self.full_refresh = True  # No conditional requests or watermarks
+        records = self._preview_records(n)
+        try:
+            sample = list(itertools.islice(records, n))
+        finally:
+            records.close()  # Stops the download and releases the response
+            self.preview_limit = None
+
+        columns: Dict[str, None] = {}
+        for record in sample:
+            columns.update(dict.fromkeys(record))
+        normalizer = RecordNormalizer(self.source)
+        suggested = normalizer.suggest_field_mapping(columns)
+        used = set(suggested.values()) | {
+            str(v).split(".")[0] for v in normalizer.field_mapping.values() if v
+        }
+        return {
+            "source_id": self.source_id,
+            "records": sample,
+            "columns": list(columns),
+            "suggested_mapping": suggested,
+            "unmapped_columns": [c for c in columns if c not in used],
+            "seconds": round(time.monotonic() - started, 2),
+        }
+
+    def _preview_records(self, n: int) -> Generator[Dict[str, Any], None, None]:
+        """
+        Records for preview(); the caller stops after ``n``. Streaming
+        collectors stop downloading there, so the default is collect().
+        """
+        yield from self.collect()
+
     # ------------------------------------------------------------------
     # HTTP session
     # ------------------------------------------------------------------
 
     @property
     def session(self) -> requests.Session:
-        """Lazy-initialized requests session with retry logic."""
+        """Shared pooled requests session for this source's host and headers."""
         if self._session is None:
             self._session = self._build_session()
         return self._session
 
-    def _build_session(self) -> requests.Session:
-        session = requests.Session()
-        session.headers.update({
+    def _build_headers(self) -> Dict[str, str]:
+        """Default request headers: user agent, auth and configured extras."""
+        headers = {
             "User-Agent": self.USER_AGENT,
             "Accept": "application/json, text/csv, */*",
-        })
+        }
 
         # Add API key header if configured
         api_key = self._get_api_key()
         if api_key and self.source.format == "soda":
-            session.headers["X-App-Token"] = api_key
+            headers["X-App-Token"] = api_key
         elif api_key:
             env_name = getattr(self.source, "api_key_env", None)
             if env_name:
-                session.headers["Authorization"] = f"Bearer {api_key}"
+                headers["Authorization"] = f"Bearer {api_key}"
 
         # Add custom headers from config
         custom_headers = getattr(self.source, "headers", None) or {}
         if custom_headers:
-            session.headers.update(custom_headers)
+            headers.update(custom_headers)
 
-        # Retry adapter
+        return headers
+
+    def _build_session(self) -> requests.Session:
+        # Retry adapter for connection/read failures only; HTTP status
+        # retries go through fetch_url so they respect the host rate limiter
         retry = Retry(
             total=self.DEFAULT_MAX_RETRIES,
-            backoff_factor=self.DEFAULT_RETRY_DELAY,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status=0,
+            backoff_factor=self.RETRY_BACKOFF,
             allowed_methods=["GET", "POST"],
-            raise_on_status=False,
         )
-        adapter = HTTPAdapter(max_retries=retry)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-
-        return session
+        return get_session_registry().get(
+            self._get_url(), self._build_headers(), retry,
+            pool_size=self._get_max_parallel_pages(),
+        )
 
     # ------------------------------------------------------------------
     # Helper methods
@@ -156,15 +251,116 @@ def _get_pagination_config(self) -> Optional[Dict[str, Any]]:
         """Get pagination configuration."""
         return getattr(self.source, "pagination", None) or {}
 
-    def _rate_limit(self, rpm: int = 60) -> None:
-        """Simple rate limiter: ensure minimum delay between requests."""
-        if rpm <= 0:
-            return
-        min_interval = 60.0 / rpm
-        elapsed = time.monotonic() - self._last_request_time
-        if elapsed < min_interval:
-            time.sleep(min_interval - elapsed)
-        self._last_request_time = time.monotonic()
+    def _get_options(self) -> Dict[str, Any]:
+        """Get collection mode options (incremental, etc.)."""
+        return getattr(self.source, "options", None) or {}
+
+    def _volatile_params(self) -> Tuple[str, ...]:
+        """
+        Request params whose values depend on the moment of collection
+        (watermarks, cursors). A replay may serve an archived response whose
+        request differs only in these.
+        """
+        return ()
+
+    def _stream_json(self) -> bool:
+        """
+        Whether JSON bodies should be parsed incrementally (options.stream_json).
+        Previews always stream, so they can stop after the first records.
+        """
+        if self.preview_limit is not None:
+            return True
+        return bool(self._get_options().get("stream_json"))
+
+    def _get_max_parallel_pages(self) -> int:
+        """Get how many pages may be fetched concurrently (1 = serial)."""
+        pagination = self._get_pagination_config() or {}
+        try:
+            return max(1, int(pagination.get("max_parallel_pages") or 1))
+        except (TypeError, ValueError):
+            return 1
+
+    def _iter_parallel(
+        self,
+        func: Callable[[Any], Any],
+        args: Iterable[Any],
+        max_workers: int,
+    ) -> Generator[Any, None, None]:
+        """
+        Call func(arg) for each arg on a thread pool and yield the results
+        in input order. At most 2 * max_workers calls are in flight, so a
+        slow consumer applies backpressure instead of buffering every page.
+        """
+        args = iter(args)
+        window = max(1, max_workers) * 2
+        with ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=f"pages-{self.source_id}",
+        ) as pool:
+            pending = deque()
+            try:
+                for arg in args:
+                    pending.append(pool.submit(func, arg))
+                    if len(pending) >= window:
+                        break
+                while pending:
+                    result = pending.popleft().result()
+                    for arg in args:
+                        pending.append(pool.submit(func, arg))
+                        break
+                    yield result
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _reserve_request_slot(self, url: str) -> float:
+        """
+        Reserve one request against the shared per-host budget and this
+        source's own rate_limit_rpm; return seconds to wait before sending.
+        """
+        limiter = get_rate_limiter()
+        wait = limiter.reserve(url)
+        rpm = self._get_rate_limit()
+        if rpm > 0:
+            # Serialized so parallel page fetches still respect the budget
+            with self._rate_lock:
+                if self._source_bucket is None:
+                    self._source_bucket = TokenBucket(rpm / 60.0, limiter.burst_allowance)
+                wait = max(wait, self._source_bucket.reserve(time.monotonic()))
+        if wait > 0:
+            self._rate_wait += wait
+            self.run_details["rate_limit_wait_seconds"] = round(self._rate_wait, 3)
+        return wait
+
+    def _throttle(self, url: str) -> None:
+        """Block until a request to ``url`` is within the rate limits."""
+        wait = self._reserve_request_slot(url)
+        if wait > 0:
+            time.sleep(wait)
+
+    def _retry_delay(self, url: str, attempt: int, resp=None) -> float:
+        """
+        Seconds to wait before retry number ``attempt`` (1-based).
+        A 429/503 blocks the whole host in the shared limiter for Retry-After
+        seconds (or the backoff), so the wait happens in _throttle and 0 is
+        returned. A Retry-After above MAX_RETRY_AFTER fails the request
+        instead of stalling the run. Other errors back off exponentially.
+        """
+        backoff = min(
+            float(self.DEFAULT_RETRY_DELAY), self.RETRY_BACKOFF * (2 ** (attempt - 1))
+        )
+        status = getattr(resp, "status_code", None)
+        if status in (429, 503):
+            retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+            if retry_after is not None and retry_after > self.MAX_RETRY_AFTER:
+                raise CollectionError(
+                    f"HTTP error {status}: {url} (Retry-After {retry_after:.0f}s)", status
+                )
+            delay = backoff if retry_after is None else retry_after
+            self.logger.info(f"HTTP {status} from {url}, pausing host for {delay:.1f}s")
+            get_rate_limiter().penalize(url, delay)
+            return 0.0
+        return backoff
 
     def _get_rate_limit(self) -> int:
         """Get configured rate limit (requests per minute)."""
@@ -182,33 +378,138 @@ def fetch_url(
         **kwargs
     ) -> requests.Response:
         """
-        Fetch a URL with rate limiting and error handling.
+        Fetch a URL with rate limiting, retries and error handling.
         """
-        self._rate_limit(self._get_rate_limit())
-        self.logger.debug(f"Fetching: {url} params={params}")
-
-        try:
-            resp = self.session.request(
-                method,
-                url,
-                params=params,
-                timeout=self._get_timeout(),
-                **kwargs
+        if self.replay is not None:
+            resp = self.replay.response_for(
+                method, url, params, kwargs.get("data"), self._volatile_params()
             )
-            resp.raise_for_status()
+            if resp.status_code >= 400:
+                raise CollectionError(
+                    f"HTTP error {resp.status_code}: {url} (replayed)", resp.status_code
+                )
+            return resp
+
+        attempt = 0
+        while True:
+            self._throttle(url)
+            self.logger.debug(f"Fetching: {url} params={params}")
+
+            try:
+                resp = self.session.request(
+                    method,
+                    url,
+                    params=params,
+                    timeout=self._get_timeout(),
+                    **kwargs
+                )
+            except requests.exceptions.Timeout:
+                raise RequestTimeout(f"Request timed out after {self._get_timeout()}s: {url}")
+            except requests.exceptions.ConnectionError as e:
+                raise CollectionError(f"Connection error: {e}")
+
+            if resp.status_code in self.RETRY_STATUSES and attempt < self.DEFAULT_MAX_RETRIES:
+                attempt += 1
+                resp.close()
+                delay = self._retry_delay(url, attempt, resp)
+                self.logger.debug(f"HTTP {resp.status_code} from {url}, retry {attempt}")
+                if delay > 0:
+                    time.sleep(delay)
+                continue
+
+            try:
+                resp.raise_for_status()
+            except requests.exceptions.HTTPError as e:
+                resp.close()
+                raise CollectionError(
+                    f"HTTP error {e.response.status_code}: {url}", e.response.status_code
+                )
+            if self.archive is not None:
+                resp = self.archive.record(
+                    method, url, params, kwargs.get("data"), resp,
+                    streamed=kwargs.get("stream", False),
+                )
             return resp
-        except requests.exceptions.Timeout:
-            raise CollectionError(f"Request timed out after {self._get_timeout()}s: {url}")
-        except requests.exceptions.ConnectionError as e:
-            raise CollectionError(f"Connection error: {e}")
-        except requests.exceptions.HTTPError as e:
-            raise CollectionError(f"HTTP error {e.response.status_code}: {url}")
+
+    # ------------------------------------------------------------------
+    # Checkpoints (resumable collection)
+    # ------------------------------------------------------------------
+
+    def get_checkpoint(self) -> Dict[str, Any]:
+        """
+        Where to resume so the next record is the one after the last yielded
+        record. The job runner stores this with every committed batch.
+        """
+        return dict(self.checkpoint)
+
+    def _resume_point(self, kind: str) -> Dict[str, Any]:
+        """The checkpoint to resume from, if it was written by this paging kind."""
+        if self.resume_from and self.resume_from.get("type") == kind:
+            self.logger.info(f"Resuming from checkpoint {self.resume_from}")
+            return dict(self.resume_from)
+        if self.resume_from:
+            self.logger.warning(
+                f"Ignoring {self.resume_from.get('type')!r} checkpoint for {kind!r} collection"
+            )
+        return {}
+
+    def _checkpoint_records(
+        self, records: Iterable[Dict[str, Any]], position: Dict[str, Any], skip: int = 0
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Yield the records of one page, checkpointing the page position plus
+        how many of its records were yielded. The first ``skip`` records were
+        already stored by the run being resumed and are dropped.
+        """
+        for index, record in enumerate(records):
+            if index < skip:
+                continue
+            self._collected_count += 1
+            self.checkpoint = {**position, "skip": index + 1}
+            yield record
+
+    # ------------------------------------------------------------------
+    # Conditional requests (ETag / Last-Modified)
+    # ------------------------------------------------------------------
+
+    def _use_conditional_requests(self) -> bool:
+        """Whether to revalidate whole-file downloads against the last run."""
+        if self.full_refresh:
+            return False
+        return self._get_options().get("conditional_requests", True) is not False
+
+    @staticmethod
+    def _validator_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Cache key for a request: the URL plus its sorted query string."""
+        if not params:
+            return url
+        sep = "&" if "?" in url else "?"
+        return f"{url}{sep}{urlencode(sorted(params.items()))}"
+
+    def _conditional_headers(self, key: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a cached URL."""
+        if not self._use_conditional_requests():
+            return {}
+        cached = self.validators.get(key) or {}
+        headers = {}
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    def _check_not_modified(self, key: str, resp) -> None:
+        """Raise SourceUnchanged on a 304, otherwise capture new validators."""
+        if resp.status_code == 304:
+            raise SourceUnchanged(f"Not modified since last run: {key}")
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if etag or last_modified:
+            self.new_validators[key] = {"etag": etag, "last_modified": last_modified}
 
     def close(self) -> None:
-        """Clean up the HTTP session."""
-        if self._session:
-            self._session.close()
-            self._session = None
+        """Release the shared HTTP session; its connections stay pooled."""
+        self._session = None
 
     def __enter__(self):
         return self
@@ -1,17 +1,27 @@
 """
 CSV data collector - handles CSV and TSV downloads.
 """
+import codecs
 import csv
 import io
+import itertools
 import logging
+import multiprocessing as mp
 import os
-import tempfile
-from typing import Generator, Dict, Any, Optional
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import (
+    Generator, Deque, Dict, Any, BinaryIO, Callable, Iterable, Iterator, List, Optional, Tuple,
+)
 
 import chardet
 import requests
 
+from src.settings import get_setting
 from .base import BaseCollector, CollectionError
+from .download_cache import PartialDownload
 
 logger = logging.getLogger(__name__)
 
@@ -24,65 +34,305 @@ class CSVCollector(BaseCollector):
     - Configurable delimiter
     - Header normalization
     - Streaming support for large files
+    - Resumable ranged downloads for very large files (collect_chunked)
+    - Optional multi-process parsing of downloaded files (options.parallel_parse)
     """
 
+    CHUNK_SIZE = 64 * 1024      # Bytes read from the network per iteration
+    SNIFF_BYTES = 10000         # Leading bytes used to detect encoding/delimiter
+    CHUNKED_THRESHOLD_MB = 100  # Content-Length above which collect() switches to chunked mode
+    PARALLEL_MIN_MB = 32        # Smallest downloaded file worth a parse process pool
+    PARALLEL_PIECE_MB = 8       # Bytes of CSV handed to a parse worker at a time
+    PREVIEW_BYTES = 256 * 1024  # Leading bytes requested by preview()
+    PREVIEW_TAIL_BYTES = 64 * 1024       # Trailing bytes (zip central directory) a zip/xlsx preview reads first
+    PREVIEW_BLOCK_BYTES = 1024 * 1024    # Bytes per Range request while previewing a zip/xlsx
+    PREVIEW_MAX_DOWNLOAD_MB = 50         # Largest zip/xlsx a preview downloads whole when Range is ignored
+
+    _file_validators: Optional[Dict[str, Any]] = None
+
     def collect(self) -> Generator[Dict[str, Any], None, None]:
-        """Yield records from the CSV file."""
+        """Yield records from the CSV file, streaming the download."""
         url = self._get_url()
         params = self._get_initial_params() or {}
+        cache_key = self._validator_key(url, params)
+
+        chunked = self._chunked_mode()
+        if chunked or (chunked is None and PartialDownload(cache_key).resumable):
+            # Forced, or an earlier run left a partial download to finish
+            yield from self.collect_chunked()
+            return
+
+        resume = self._resume_point("csv")
+        if resume:
+            yield from self._collect_resumed(url, params, resume)
+            return
 
         self.logger.info(f"Downloading CSV from: {url}")
-        resp = self.fetch_url(url, params=params or None)
+        resp = self.fetch_url(
+            url, params=params or None, headers=self._conditional_headers(cache_key),
+            stream=True,
+        )
+        try:
+            self._check_not_modified(cache_key, resp)
+            length = resp.headers.get("Content-Length", "")
+            if chunked is None and length.isdigit() and int(length) > self._chunked_threshold():
+                self.logger.info(
+                    f"{int(length) / 1048576:.0f} MB download: switching to chunked mode"
+                )
+                yield from self.collect_chunked(response=resp)
+                return
+            self._file_validators = _response_validators(resp)
+            yield from self._parse_stream(
+                resp.iter_content(chunk_size=self.CHUNK_SIZE),
+                resp.headers.get("Content-Type", ""),
+            )
+        finally:
+            resp.close()
+
+    def _preview_records(self, n: int) -> Generator[Dict[str, Any], None, None]:
+        """
+        Ask for the first PREVIEW_BYTES of the file only (Range). A 206 is
+        cut after its last complete record; a server that ignores Range
+        sends the whole file, which is streamed and dropped after ``n`` rows.
+        """
+        url = self._get_url()
+        params = self._get_initial_params() or {}
+        headers = {"Range": f"bytes=0-{self.PREVIEW_BYTES - 1}", "Accept-Encoding": "identity"}
+        resp = self.fetch_url(url, params=params or None, headers=headers, stream=True)
+        try:
+            chunks = resp.iter_content(chunk_size=self.CHUNK_SIZE)
+            if resp.status_code == 206:
+                body = b"".join(chunks)
+                _, total = _content_range(resp.headers.get("Content-Range"))
+                chunks = [body if total == len(body) else _complete_records(body)]
+            yield from self._parse_stream(chunks, resp.headers.get("Content-Type", ""))
+        finally:
+            resp.close()
+
+    def _open_for_preview(self) -> BinaryIO:
+        """
+        The source file as a seekable binary file, for previewing formats
+        whose index ends the file (zip, xlsx). With Range support the last
+        PREVIEW_TAIL_BYTES are fetched first and the rest only as it is
+        read, so a preview costs the central directory and the start of the
+        first member. A server that ignores Range sends the whole file,
+        which is kept only up to PREVIEW_MAX_DOWNLOAD_MB.
+        """
+        url = self._get_url()
+        params = self._get_initial_params() or {}
+        headers = {"Range": f"bytes=-{self.PREVIEW_TAIL_BYTES}", "Accept-Encoding": "identity"}
+        resp = self.fetch_url(url, params=params or None, headers=headers, stream=True)
+        try:
+            _, total = _content_range(resp.headers.get("Content-Range"))
+            if resp.status_code == 206 and total is not None:
+                tail = resp.content
+
+                def fetch(first: int, last: int) -> bytes:
+                    headers = {"Range": f"bytes={first}-{last}", "Accept-Encoding": "identity"}
+                    part = self.fetch_url(url, params=params or None, headers=headers)
+                    if part.status_code != 206:
+                        raise CollectionError(f"Range request ignored while previewing {url}")
+                    return part.content
+
+                return io.BufferedReader(
+                    _RangedFile(fetch, total, tail), buffer_size=self.PREVIEW_BLOCK_BYTES
+                )
+
+            limit = self.PREVIEW_MAX_DOWNLOAD_MB * 1048576
+            too_large = CollectionError(
+                f"{url} ignores Range requests; previewing it would download more "
+                f"than {self.PREVIEW_MAX_DOWNLOAD_MB} MB"
+            )
+            length = resp.headers.get("Content-Length", "")
+            if length.isdigit() and int(length) > limit:
+                raise too_large
+            body = io.BytesIO()
+            for chunk in resp.iter_content(chunk_size=self.CHUNK_SIZE):
+                body.write(chunk)
+                if body.tell() > limit:
+                    raise too_large
+            body.seek(0)
+            return body
+        finally:
+            resp.close()
+
+    def _collect_resumed(
+        self, url: str, params: dict, resume: Dict[str, Any]
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Continue an interrupted download. If the checkpoint has a byte offset
+        and the file has a strong validator, only the rest of the file is
+        requested (Range + If-Range); otherwise the whole file is read again
+        and the rows already stored are skipped.
+        """
+        offset = resume.get("byte_offset")
+        validator = resume.get("etag")
+        if not validator or validator.startswith("W/"):
+            validator = resume.get("last_modified")
+        headers = {}
+        if offset and validator and resume.get("fieldnames"):
+            headers = {"Range": f"bytes={offset}-", "If-Range": validator}
+
+        resp = self.fetch_url(url, params=params or None, headers=headers, stream=True)
+        try:
+            self._file_validators = _response_validators(resp)
+            chunks = resp.iter_content(chunk_size=self.CHUNK_SIZE)
+            if resp.status_code == 206:
+                self.logger.info(
+                    f"Resuming CSV at byte {offset} (row {resume.get('rows', 0)})"
+                )
+                self.run_details["resumed_at_byte"] = offset
+                yield from self._parse_stream(chunks, start=resume)
+            else:
+                if headers:
+                    self.logger.info("CSV changed or Range unsupported; re-reading from the start")
+                yield from self._parse_stream(
+                    chunks, resp.headers.get("Content-Type", ""),
+                    skip_rows=int(resume.get("rows", 0)),
+                )
+        finally:
+            resp.close()
 
-        # Detect encoding
-        encoding = self._detect_encoding(resp)
-        self.logger.debug(f"Detected encoding: {encoding}")
+    def get_checkpoint(self) -> Dict[str, Any]:
+        """Rows consumed so far and the byte offset the next row starts at."""
+        position = getattr(self, "_csv_position", None)
+        return {"type": "csv", **position} if position else {}
 
-        # Detect delimiter
-        delimiter = self._detect_delimiter(resp.content[:4096], encoding)
-        self.logger.debug(f"Detected delimiter: {repr(delimiter)}")
+    def _parse_stream(
+        self,
+        chunks: Iterable[bytes],
+        content_type: str = "",
+        skip_rows: int = 0,
+        start: Optional[Dict[str, Any]] = None,
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Parse CSV from an iterable of byte chunks with bounded memory.
+        Encoding and delimiter are sniffed from the first block; the rest
+        is decoded incrementally and fed line by line to the csv reader.
+
+        The first ``skip_rows`` data rows are dropped. ``start`` is a CSV
+        checkpoint when ``chunks`` begin mid-file: its encoding, delimiter
+        and header are reused instead of being sniffed.
+        """
+        chunks = iter(chunks)
+        position = {"rows": 0, "byte_offset": 0, **(self._file_validators or {})}
+        if start:
+            encoding, delimiter = start["encoding"], start["delimiter"]
+            position.update(rows=int(start.get("rows", 0)),
+                            byte_offset=int(start["byte_offset"]))
+            lines = self._decode_lines(chunks, encoding, position)
+            fieldnames = list(start["fieldnames"])
+        else:
+            head = b""
+            for chunk in chunks:
+                head += chunk
+                if len(head) >= self.SNIFF_BYTES:
+                    break
+            if not head:
+                return
+
+            # Detect encoding
+            encoding = self._detect_encoding(head, content_type)
+            self.logger.debug(f"Detected encoding: {encoding}")
+
+            # Detect delimiter
+            delimiter = self._detect_delimiter(head[:4096], encoding)
+            self.logger.debug(f"Detected delimiter: {repr(delimiter)}")
+
+            if head.startswith(codecs.BOM_UTF8) and _codec_name(encoding) == "utf-8-sig":
+                position["byte_offset"] = len(codecs.BOM_UTF8)
+            lines = self._decode_lines(itertools.chain([head], chunks), encoding, position)
+            fieldnames = None
+        position.update(encoding=encoding, delimiter=delimiter)
 
         # Parse CSV
         try:
-            text = resp.content.decode(encoding, errors="replace")
             reader = csv.DictReader(
-                io.StringIO(text),
+                lines,
+                fieldnames=fieldnames,
                 delimiter=delimiter,
                 quoting=csv.QUOTE_MINIMAL,
             )
 
             # Normalize headers
-            if reader.fieldnames:
+            if reader.fieldnames and fieldnames is None:
                 reader.fieldnames = [
                     self._normalize_header(h) for h in reader.fieldnames
                 ]
+            position["fieldnames"] = reader.fieldnames
+            self._csv_position = position
 
             for row in reader:
-                # Clean up the row dict
-                clean = {k: (v.strip() if isinstance(v, str) else v)
-                         for k, v in row.items() if k}
-                # Remove empty rows
-                if any(v for v in clean.values()):
+                position["rows"] += 1
+                if position["rows"] <= skip_rows:
+                    continue
+                clean = _clean_row(row)
+                if clean is not None:
                     self._collected_count += 1
                     yield clean
 
+        except (CollectionError, requests.exceptions.RequestException):
+            raise
         except Exception as e:
             raise CollectionError(f"CSV parsing error: {e}")
 
-    def _detect_encoding(self, resp: requests.Response) -> str:
-        """Detect character encoding from response."""
+    def _decode_lines(
+        self,
+        chunks: Iterable[bytes],
+        encoding: str,
+        position: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[str]:
+        """
+        Incrementally decode byte chunks and yield complete lines. If
+        ``position`` is given, its ``byte_offset`` is advanced past each line
+        before it is yielded (None once offsets can no longer be trusted).
+        """
+        try:
+            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        except LookupError:
+            self.logger.warning(f"Unknown encoding {encoding!r}, using utf-8")
+            encoding = "utf-8"
+            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        measure = _line_byte_length(encoding) if position is not None else None
+        if position is not None and measure is None:
+            position["byte_offset"] = None
+
+        pending = ""
+        for chunk in chunks:
+            text = pending + decoder.decode(chunk)
+            lines = text.split("\n")
+            pending = lines.pop()
+            for line in lines:
+                line += "\n"
+                if measure is not None and position["byte_offset"] is not None:
+                    position["byte_offset"] = _advance(position["byte_offset"], line, measure)
+                yield line
+
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            if measure is not None and position["byte_offset"] is not None:
+                position["byte_offset"] = _advance(position["byte_offset"], pending, measure)
+            yield pending
+
+    def _detect_encoding(self, sample: bytes, content_type: str = "") -> str:
+        """Detect character encoding from the Content-Type or a byte sample."""
         # Try Content-Type header first
-        content_type = resp.headers.get("Content-Type", "")
         if "charset=" in content_type:
             charset = content_type.split("charset=")[-1].split(";")[0].strip()
-            return charset
+            encoding = charset.strip('"')
+        else:
+            # Use chardet for binary detection
+            encoding = "utf-8"
+            detected = chardet.detect(sample[:self.SNIFF_BYTES])
+            if detected and detected.get("confidence", 0) > 0.7:
+                encoding = detected["encoding"] or "utf-8"
 
-        # Use chardet for binary detection
-        detected = chardet.detect(resp.content[:10000])
-        if detected and detected.get("confidence", 0) > 0.7:
-            return detected["encoding"] or "utf-8"
-
-        return "utf-8"
+        # Drop a UTF-8 byte-order mark so it doesn't end up in the first header
+        if sample.startswith(codecs.BOM_UTF8) and encoding.lower().replace("_", "-") in (
+            "utf-8", "utf8", "ascii"
+        ):
+            return "utf-8-sig"
+        return encoding
 
     def _detect_delimiter(self, sample_bytes: bytes, encoding: str) -> str:
         """Auto-detect CSV delimiter from file sample."""
@@ -122,54 +372,464 @@ def _normalize_header(self, header: str) -> str:
 
     def collect_chunked(
         self,
-        chunk_size: int = 10000
+        chunk_size: int = 10000,
+        response: Optional[requests.Response] = None,
     ) -> Generator[Dict[str, Any], None, None]:
         """
         Memory-efficient streaming collection for very large CSV files.
-        Downloads to a temp file then streams parsing.
+        Downloads to the download cache then streams parsing. A dropped
+        connection, or a partial file left by an earlier run, only costs
+        the missing tail (Range + If-Range). ``response`` is an already
+        open full response to start the download from.
+        """
+        skip_rows = int(self._resume_point("csv").get("rows", 0))
+        with self._download_file(response) as cache:
+            content_type = cache.meta.get("content_type", "")
+            workers = self._parse_workers(cache.size)
+            if workers > 1:
+                yield from self._parse_file_parallel(cache.path, workers, content_type, skip_rows)
+            else:
+                with open(cache.path, "rb") as f:
+                    yield from self._parse_stream(
+                        iter(lambda: f.read(self.CHUNK_SIZE), b""),
+                        content_type,
+                        skip_rows=skip_rows,
+                    )
+            cache.discard()
+
+    def _download_file(self, response: Optional[requests.Response] = None) -> PartialDownload:
+        """
+        Download the source file into the download cache (resuming a partial
+        file if there is one) and record its validators. The entry is
+        returned locked: the caller parses ``cache.path`` inside ``with
+        cache:`` and discards the entry once it has been read.
         """
         url = self._get_url()
         params = self._get_initial_params() or {}
+        cache_key = self._validator_key(url, params)
+        cache = PartialDownload(cache_key)
+        cache.acquire()
+        try:
+            self._download_to_cache(url, params, cache, response)
+        except BaseException:
+            cache.release()
+            raise
+        meta = cache.meta
+        self._file_validators = {
+            "etag": meta.get("etag"), "last_modified": meta.get("last_modified"),
+        }
+        if meta.get("etag") or meta.get("last_modified"):
+            self.new_validators[cache_key] = dict(self._file_validators)
+        return cache
+
+    def _chunked_mode(self) -> Optional[bool]:
+        """
+        options.chunked_download: true/false forces the mode; the default
+        (auto, None here) picks chunked mode by Content-Length.
+        """
+        if self.replay is not None:
+            return False  # Archived bodies are replayed in one pass
+        mode = self._get_options().get("chunked_download", "auto")
+        return None if mode == "auto" else bool(mode)
 
-        with tempfile.NamedTemporaryFile(mode="wb", suffix=".csv", delete=False) as tmp:
-            tmp_path = tmp.name
+    def _chunked_threshold(self) -> int:
+        """Content-Length (bytes) above which collect() switches to chunked mode."""
+        mb = self._get_options().get("chunked_threshold_mb") or get_setting(
+            "collection.chunked_download_threshold_mb", self.CHUNKED_THRESHOLD_MB
+        )
+        return int(float(mb) * 1024 * 1024)
+
+    def _parse_workers(self, size: int) -> int:
+        """
+        Processes to parse a downloaded file with: options.parallel_parse
+        (true = one per CPU, or a number), else collection.csv_parse_workers.
+        Files under PARALLEL_MIN_MB are always parsed in-process.
+        """
+        setting = self._get_options().get("parallel_parse")
+        if setting is None:
+            setting = get_setting("collection.csv_parse_workers", 0)
+        if setting is True:
+            workers = os.cpu_count() or 1
+        else:
+            workers = int(setting or 0)
+        if workers > 1 and size < self.PARALLEL_MIN_MB * 1024 * 1024:
+            return 1
+        return workers
+
+    def _parse_file_parallel(
+        self, path: str, workers: int, content_type: str = "", skip_rows: int = 0
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Parse a downloaded CSV file in a process pool. The header is read
+        here; the rest of the file is cut at record boundaries into pieces
+        of about PARALLEL_PIECE_MB, each piece is parsed by a worker, and the
+        rows are yielded in file order as results come back (at most two
+        pieces per worker are in flight, so memory stays bounded).
+
+        Record boundaries are found by quote parity, which assumes RFC 4180
+        quoting (a quote character only appears in quoted fields). Files in
+        encodings where quotes and newlines are not single ASCII bytes
+        (e.g. UTF-16) are parsed sequentially.
+        """
+        with open(path, "rb") as f:
+            head = f.read(self.SNIFF_BYTES)
+            if not head:
+                return
+            encoding = self._detect_encoding(head, content_type)
+            delimiter = self._detect_delimiter(head[:4096], encoding)
+            codec = _codec_name(encoding)
+            if _line_byte_length(encoding) is None:
+                self.logger.info(f"Parsing {encoding} CSV sequentially")
+                f.seek(0)
+                yield from self._parse_stream(
+                    iter(lambda: f.read(self.CHUNK_SIZE), b""), content_type, skip_rows=skip_rows,
+                )
+                return
+
+            # Read the header with the streaming decoder to find where it ends
+            f.seek(0)
+            position = {"rows": 0, "byte_offset": 0, **(self._file_validators or {})}
+            if head.startswith(codecs.BOM_UTF8) and codec == "utf-8-sig":
+                position["byte_offset"] = len(codecs.BOM_UTF8)
+            lines = self._decode_lines(iter(lambda: f.read(self.CHUNK_SIZE), b""), encoding, position)
             try:
-                with self.session.get(
-                    url, params=params or None,
-                    stream=True, timeout=self._get_timeout()
-                ) as resp:
-                    resp.raise_for_status()
-                    total_bytes = 0
-                    for chunk in resp.iter_content(chunk_size=8192):
-                        tmp.write(chunk)
-                        total_bytes += len(chunk)
-                    self.logger.info(f"Downloaded {total_bytes / 1024:.1f} KB to {tmp_path}")
-
-                encoding = "utf-8"
-                with open(tmp_path, "rb") as f:
-                    detected = chardet.detect(f.read(10000))
-                    if detected and detected.get("confidence", 0) > 0.7:
-                        encoding = detected["encoding"] or "utf-8"
-
-                with open(tmp_path, encoding=encoding, errors="replace") as f:
-                    reader = csv.DictReader(f)
-                    if reader.fieldnames:
-                        reader.fieldnames = [
-                            self._normalize_header(h) for h in reader.fieldnames
-                        ]
-                    for row in reader:
-                        clean = {k: (v.strip() if isinstance(v, str) else v)
-                                 for k, v in row.items() if k}
-                        if any(v for v in clean.values()):
-                            self._collected_count += 1
-                            yield clean
+                header = next(csv.reader(lines, delimiter=delimiter, quoting=csv.QUOTE_MINIMAL), None)
+            except csv.Error as e:
+                raise CollectionError(f"CSV parsing error: {e}")
+            data_start = position["byte_offset"]
+            if header is None or data_start is None:
+                f.seek(0)
+                yield from self._parse_stream(
+                    iter(lambda: f.read(self.CHUNK_SIZE), b""), content_type, skip_rows=skip_rows,
+                )
+                return
 
-            finally:
+        fieldnames = [self._normalize_header(h) for h in header]
+        position.update(encoding=encoding, delimiter=delimiter, fieldnames=fieldnames)
+        self._csv_position = position
+        points = _record_boundaries(
+            path, data_start, os.path.getsize(path), self.PARALLEL_PIECE_MB * 1024 * 1024
+        )
+        # Pieces never start at the BOM, so decode without the -sig variant
+        piece_encoding = "utf-8" if codec == "utf-8-sig" else encoding
+        self.logger.info(
+            f"Parsing {(points[-1] - data_start) / 1048576:.0f} MB CSV in "
+            f"{len(points) - 1} pieces with {workers} processes"
+        )
+
+        pieces = iter(zip(points, points[1:]))
+        # spawn: forking a threaded scheduler process can copy held locks
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"))
+        pending: Deque = deque()
+
+        def submit(count: int) -> None:
+            for start, end in itertools.islice(pieces, count):
+                future = pool.submit(
+                    _parse_csv_piece, path, start, end, piece_encoding, delimiter, fieldnames
+                )
+                pending.append((future, end))
+
+        try:
+            submit(workers * 2)
+            while pending:
+                future, end = pending.popleft()
                 try:
-                    os.unlink(tmp_path)
-                except OSError:
-                    pass
+                    rows = future.result()
+                except csv.Error as e:
+                    raise CollectionError(f"CSV parsing error: {e}")
+                except BrokenProcessPool as e:
+                    raise CollectionError(f"CSV parse worker failed: {e}")
+                submit(1)
+                position["byte_offset"] = None  # Only known at piece boundaries
+                for clean in rows:
+                    position["rows"] += 1
+                    if position["rows"] <= skip_rows or clean is None:
+                        continue
+                    self._collected_count += 1
+                    yield clean
+                position["byte_offset"] = end
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _download_to_cache(
+        self,
+        url: str,
+        params: dict,
+        cache: PartialDownload,
+        response: Optional[requests.Response] = None,
+    ) -> None:
+        """
+        Download the file into ``cache``, retrying dropped transfers from
+        the last byte on disk, until it matches its Content-Length.
+        """
+        if response is not None and response.headers.get(
+            "Content-Encoding", "identity"
+        ).lower() != "identity":
+            # Byte ranges need the unencoded body; ask again without gzip
+            response.close()
+            response = None
+
+        attempt = 0
+        resp = response
+        while True:
+            try:
+                if resp is None:
+                    resp = self._request_tail(url, params, cache, first=attempt == 0)
+                self._write_tail(resp, cache)
+                break
+            except (CollectionError, requests.exceptions.RequestException) as e:
+                attempt += 1
+                if attempt > self.DEFAULT_MAX_RETRIES:
+                    raise CollectionError(f"Download failed after {attempt} attempts: {e}")
+                delay = self._retry_delay(url, attempt)
+                self.logger.warning(
+                    f"Download interrupted at {cache.size / 1048576:.1f} MB ({e}); "
+                    f"resuming in {delay:.1f}s"
+                )
+                time.sleep(delay)
+            finally:
+                if resp is not None:
+                    resp.close()
+                    resp = None
+
+        self.run_details["download_bytes"] = cache.size
+        self.logger.info(f"Downloaded {cache.size / 1024:.1f} KB to {cache.path}")
+
+    def _request_tail(
+        self, url: str, params: dict, cache: PartialDownload, first: bool = False
+    ) -> requests.Response:
+        """
+        Request the part of the file not yet in the cache. A fresh first
+        request is conditional, like collect().
+        """
+        headers = {"Accept-Encoding": "identity"}
+        size = cache.size
+        if cache.resumable:
+            # Ask from the last byte held, so a complete file still gets a 206
+            # (and not a 416) while If-Range confirms it is unchanged
+            headers.update({"Range": f"bytes={size - 1}-", "If-Range": cache.if_range})
+            self.logger.info(f"Resuming download at {size / 1048576:.1f} MB")
+        elif first:
+            headers.update(self._conditional_headers(cache.key))
+        resp = self.fetch_url(url, params=params or None, headers=headers, stream=True)
+        if "Range" not in headers:
+            try:
+                self._check_not_modified(cache.key, resp)
+            except Exception:
+                resp.close()
+                raise
+        return resp
+
+    def _write_tail(self, resp: requests.Response, cache: PartialDownload) -> None:
+        """Write a 206 tail (or a full 200 body) into the cache file."""
+        if resp.status_code == 206:
+            start, total = _content_range(resp.headers.get("Content-Range"))
+            expected = cache.content_length
+            if start is None or start > cache.size or (
+                expected is not None and total is not None and total != expected
+            ):
+                cache.discard()
+                raise CollectionError(
+                    f"Unexpected Content-Range {resp.headers.get('Content-Range')!r}"
+                )
+            self.run_details["download_bytes_reused"] = (
+                self.run_details.get("download_bytes_reused", 0) + start
+            )
+        else:
+            if cache.size:
+                self.logger.info("File changed or Range unsupported; downloading from the start")
+            cache.start(resp.headers)
+            start = 0
+
+        with open(cache.path, "r+b") as f:
+            f.seek(start)
+            f.truncate()
+            for chunk in resp.iter_content(chunk_size=self.CHUNK_SIZE):
+                f.write(chunk)
+
+        expected = cache.content_length
+        if expected is not None and cache.size != expected:
+            raise CollectionError(f"Download ended at {cache.size} of {expected} bytes")
 
     def get_count(self) -> Optional[int]:
         """Try to get line count by downloading the file (if small)."""
         return None  # Not efficient to count without downloading
+
+
+def _clean_row(row: Dict[Optional[str], Any]) -> Optional[Dict[str, Any]]:
+    """Strip a DictReader row and drop unnamed extra fields; None if it is empty."""
+    clean = {k: (v.strip() if isinstance(v, str) else v) for k, v in row.items() if k}
+    return clean if any(v for v in clean.values()) else None
+
+
+def _record_boundaries(path: str, start: int, end: int, piece_size: int) -> List[int]:
+    """
+    Offsets that cut ``path[start:end]`` into pieces of about ``piece_size``
+    bytes, each ending just after a newline that is outside quotes (an even
+    number of quote characters since ``start``). ``start`` must itself be a
+    record boundary. The file is scanned once with bytes.count/find.
+    """
+    points = [start]
+    target = start + piece_size
+    odd = False        # Quote parity at ``pos``
+    pos = start        # File offset of ``block[0]``
+    with open(path, "rb") as f:
+        f.seek(start)
+        while target < end:
+            block = f.read(max(piece_size, 1 << 20))
+            if not block:
+                break
+            block_end = pos + len(block)
+            cursor = 0          # Parity below is valid at block[cursor]
+            parity = odd
+            while target < block_end:
+                newline = block.find(b"\n", max(target - pos, cursor))
+                if newline == -1:
+                    break
+                parity ^= block.count(b'"', cursor, newline) % 2 == 1
+                cursor = newline
+                if not parity:
+                    points.append(pos + newline + 1)
+                    target = pos + newline + 1 + piece_size
+                else:
+                    target = pos + newline + 1   # Inside a quoted field: try the next line
+            odd = parity ^ (block.count(b'"', cursor) % 2 == 1)
+            pos = block_end
+    if points[-1] < end:
+        points.append(end)
+    return points
+
+
+def _complete_records(data: bytes) -> bytes:
+    """
+    Cut a truncated CSV prefix just after its last newline that is outside
+    quotes, so a partial last record is not parsed.
+    """
+    odd = data.count(b'"') % 2 == 1  # Quote parity at ``end``
+    end = len(data)
+    while True:
+        newline = data.rfind(b"\n", 0, end)
+        if newline == -1:
+            return data
+        odd ^= data.count(b'"', newline, end) % 2 == 1
+        if not odd:
+            return data[:newline + 1]
+        end = newline
+
+
+def _parse_csv_piece(
+    path: str, start: int, end: int, encoding: str, delimiter: str, fieldnames: List[str]
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Process pool worker: parse ``path[start:end]`` (whole records) exactly
+    as CSVCollector._parse_stream would. Returns one entry per CSV row, None
+    for empty rows, so the parent can keep counting rows for checkpoints.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode(encoding, errors="replace")
+
+    def lines() -> Iterator[str]:
+        parts = text.split("\n")
+        last = parts.pop()
+        for line in parts:
+            yield line + "\n"
+        if last:
+            yield last
+
+    reader = csv.DictReader(
+        lines(), fieldnames=fieldnames, delimiter=delimiter, quoting=csv.QUOTE_MINIMAL
+    )
+    return [_clean_row(row) for row in reader]
+
+
+def _response_validators(resp) -> Dict[str, Any]:
+    """ETag / Last-Modified of a download, kept with CSV checkpoints."""
+    return {
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+    }
+
+
+def _line_byte_length(encoding: str):
+    """
+    A function giving the encoded size of a decoded line, or None if byte
+    offsets cannot be tracked for this encoding (e.g. UTF-16).
+    """
+    name = _codec_name(encoding)
+    if name in ("utf-8", "utf-8-sig"):
+        return lambda line: len(line) if line.isascii() else len(line.encode("utf-8"))
+    if name == "ascii" or name.startswith(("iso8859", "cp125", "latin", "mac-")):
+        return len  # Single-byte encodings
+    return None
+
+
+def _codec_name(encoding: str) -> Optional[str]:
+    try:
+        return codecs.lookup(encoding).name
+    except LookupError:
+        return None
+
+
+def _advance(offset: int, line: str, measure) -> Optional[int]:
+    # A replacement character hides how many bytes were malformed
+    if "\ufffd" in line:
+        return None
+    return offset + measure(line)
+
+
+class _RangedFile(io.RawIOBase):
+    """
+    Read-only, seekable view of a remote file of ``size`` bytes. ``tail``
+    holds its last bytes, already fetched; other reads call
+    ``fetch(first, last)`` for that inclusive byte range.
+    """
+
+    def __init__(self, fetch: Callable[[int, int], bytes], size: int, tail: bytes):
+        self._fetch = fetch
+        self._size = size
+        self._tail = tail
+        self._tail_start = size - len(tail)
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self._size
+        self._pos = max(0, offset)
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        end = min(self._pos + len(buffer), self._size)
+        if end <= self._pos:
+            return 0
+        if self._pos >= self._tail_start:
+            data = self._tail[self._pos - self._tail_start:end - self._tail_start]
+        else:
+            data = self._fetch(self._pos, min(end, self._tail_start) - 1)
+        buffer[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+
+def _content_range(value: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """(first byte, complete length) of a ``bytes a-b/total`` Content-Range."""
+    try:
+        unit, spec = (value or "").split(" ", 1)
+        byte_range, total = spec.split("/", 1)
+        first = int(byte_range.split("-", 1)[0])
+    except ValueError:
+        return None, None
+    if unit.strip().lower() != "bytes":
+        return None, None
+    return first, int(total) if total.strip().isdigit() else None
@@ -0,0 +1,151 @@
+"""
+On-disk cache of partially downloaded files for ranged resume.
+
+Large whole-file downloads (multi-hundred-MB federal CSVs) are written to
+``storage.download_cache_dir`` instead of an anonymous temp file, next to a
+small JSON sidecar holding the validators of the response they came from:
+
+    <cache_dir>/<key>.part        bytes received so far
+    <cache_dir>/<key>.json        {"url", "etag", "last_modified", "content_length", ...}
+
+After a dropped connection, or a failed run, only the missing tail is
+requested again with ``Range`` + ``If-Range``. The entry is removed once
+the file has been parsed successfully. A run holds a lock on the entry
+(``<key>.lock``) while it downloads and parses, so overlapping runs of a
+source never write the same partial file.
+"""
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, Mapping, Optional
+
+from src.settings import PROJECT_ROOT, get_setting
+from .base import CollectionError
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+
+def download_cache_dir() -> str:
+    """Absolute path of ``storage.download_cache_dir`` (relative to the project root)."""
+    path = get_setting("storage.download_cache_dir", os.path.join("data", "cache", "downloads"))
+    return path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
+
+
+class PartialDownload:
+    """One cached download: the partial body plus the validators it matches."""
+
+    def __init__(self, key: str, cache_dir: Optional[str] = None):
+        cache_dir = cache_dir or download_cache_dir()
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:24]
+        self.key = key
+        self.path = os.path.join(cache_dir, f"{digest}.part")
+        self.meta_path = os.path.join(cache_dir, f"{digest}.json")
+        self.lock_path = os.path.join(cache_dir, f"{digest}.lock")
+        self.meta: Dict[str, Any] = self._load_meta()
+        self._lock = None
+
+    def __enter__(self) -> "PartialDownload":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+    def acquire(self) -> None:
+        """
+        Lock the entry for this run and reload its sidecar. Raises
+        CollectionError if another run holds the lock.
+        """
+        os.makedirs(os.path.dirname(self.lock_path), exist_ok=True)
+        lock = open(self.lock_path, "a+b")
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            lock.close()
+            raise CollectionError(
+                f"Another run is downloading {self.key}; try again once it finishes"
+            )
+        self._lock = lock
+        self.meta = self._load_meta()
+
+    def release(self) -> None:
+        """Release the lock taken by acquire(); closing the file drops it."""
+        if self._lock is not None:
+            self._lock.close()
+            self._lock = None
+
+    def _load_meta(self) -> Dict[str, Any]:
+        try:
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return meta if isinstance(meta, dict) and meta.get("url") == self.key else {}
+
+    @property
+    def size(self) -> int:
+        """Bytes already on disk (0 if there is no partial file)."""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    @property
+    def content_length(self) -> Optional[int]:
+        length = self.meta.get("content_length")
+        return int(length) if length is not None else None
+
+    @property
+    def if_range(self) -> Optional[str]:
+        """
+        The validator to send as If-Range, or None if the cached bytes
+        cannot be resumed. Weak ETags are not allowed in If-Range.
+        """
+        etag = self.meta.get("etag")
+        if etag and not etag.startswith("W/"):
+            return etag
+        return self.meta.get("last_modified")
+
+    @property
+    def resumable(self) -> bool:
+        return self.size > 0 and self.if_range is not None
+
+    def start(self, headers: Mapping[str, str]) -> None:
+        """Begin a fresh download: truncate the body and record the response validators."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        open(self.path, "wb").close()
+        length = headers.get("Content-Length")
+        self.meta = {
+            "url": self.key,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "content_type": headers.get("Content-Type", ""),
+            "content_length": int(length) if length and length.isdigit() else None,
+        }
+        if headers.get("Content-Encoding", "identity").lower() != "identity":
+            # The cached body is decoded, so byte ranges of the encoded
+            # response no longer line up with it
+            self.meta.update(etag=None, last_modified=None, content_length=None)
+        with open(self.meta_path, "w") as f:
+            json.dump(self.meta, f)
+
+    def discard(self) -> None:
+        """Remove the cached body and its sidecar."""
+        for path in (self.path, self.meta_path):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not remove {path}: {e}")
+        self.meta = {}
@@ -2,9 +2,10 @@
 GeoJSON collector - handles GeoJSON and Overpass API responses.
 """
 import logging
-from typing import Generator, Dict, Any, Optional
+from typing import Generator, Dict, Any, List, Optional, Tuple
 
-from .base import BaseCollector, CollectionError
+from .base import BaseCollector, CollectionError, RequestTimeout
+from .json_stream import JSONRecordStream
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +17,9 @@ class GeoJSONCollector(BaseCollector):
     feature properties + geometry coordinates into a flat dict.
     """
 
+    OVERPASS_TILE_PARALLEL = 2   # Public Overpass instances allow ~2 slots per IP
+    OVERPASS_TILE_DEPTH = 3      # Times a failing tile may be split into quadrants
+
     def collect(self) -> Generator[Dict[str, Any], None, None]:
         """Yield records from a GeoJSON source."""
         url = self._get_url()
@@ -26,13 +30,47 @@ def collect(self) -> Generator[Dict[str, Any], None, None]:
             yield from self._collect_overpass(url, params)
             return
 
-        resp = self.fetch_url(url, params=params or None)
+        cache_key = self._validator_key(url, params)
+        resp = self.fetch_url(
+            url, params=params or None, headers=self._conditional_headers(cache_key),
+            stream=self._stream_json(),
+        )
+        if self._stream_json():
+            try:
+                self._check_not_modified(cache_key, resp)
+                yield from self._stream_geojson(resp)
+            finally:
+                resp.close()
+            return
+
+        self._check_not_modified(cache_key, resp)
 
         try:
             geojson = resp.json()
         except ValueError as e:
             raise CollectionError(f"GeoJSON parse error: {e}")
 
+        yield from self._records_from_geojson(geojson)
+
+    def _stream_geojson(self, resp) -> Generator[Dict[str, Any], None, None]:
+        """Flatten features one at a time from a streamed FeatureCollection."""
+        stream = JSONRecordStream(
+            resp.iter_content(chunk_size=self.JSON_CHUNK_SIZE), record_keys=("features",)
+        )
+        for feature in stream:
+            record = self._flatten_feature(feature)
+            if record:
+                self._collected_count += 1
+                yield record
+
+        if stream.record_key is None:
+            # Not a FeatureCollection (single Feature or unexpected payload)
+            if not isinstance(stream.document, dict):
+                raise CollectionError("GeoJSON parse error: expected a JSON object")
+            yield from self._records_from_geojson(stream.document)
+
+    def _records_from_geojson(self, geojson: dict) -> Generator[Dict[str, Any], None, None]:
+        """Yield flattened records from a decoded Feature or FeatureCollection."""
         geojson_type = geojson.get("type", "")
 
         if geojson_type == "FeatureCollection":
@@ -59,11 +97,22 @@ def _collect_overpass(
         self, url: str, params: dict
     ) -> Generator[Dict[str, Any], None, None]:
         """Handle OpenStreetMap Overpass API queries."""
-        query = params.get("data") or params.get("query", "")
-        if not query:
-            raise CollectionError("No Overpass query 'data' parameter configured.")
+        query = self._get_overpass_query(params)
+
+        tiling = self._get_options().get("overpass_tiles")
+        if tiling:
+            yield from self._collect_overpass_tiled(url, query, tiling)
+            return
 
         self.logger.info(f"Running Overpass query: {query[:100]}...")
+        if self._stream_json():
+            resp = self.fetch_url(url, method="POST", data={"data": query}, stream=True)
+            try:
+                yield from self._stream_overpass(resp)
+            finally:
+                resp.close()
+            return
+
         resp = self.fetch_url(url, method="POST", data={"data": query})
 
         try:
@@ -71,6 +120,25 @@ def _collect_overpass(
         except ValueError as e:
             raise CollectionError(f"Overpass response parse error: {e}")
 
+        yield from self._records_from_overpass(result)
+
+    def _stream_overpass(self, resp) -> Generator[Dict[str, Any], None, None]:
+        """Flatten OSM elements one at a time from a streamed Overpass result."""
+        stream = JSONRecordStream(
+            resp.iter_content(chunk_size=self.JSON_CHUNK_SIZE), record_keys=("elements",)
+        )
+        for element in stream:
+            record = self._flatten_osm_element(element)
+            if record:
+                self._collected_count += 1
+                yield record
+
+        remark = stream.document.get("remark") if isinstance(stream.document, dict) else None
+        if remark:
+            self.logger.warning(f"Overpass remark: {remark}")
+
+    def _records_from_overpass(self, result: dict) -> Generator[Dict[str, Any], None, None]:
+        """Yield flattened records from a decoded Overpass JSON result."""
         elements = result.get("elements", [])
         for element in elements:
             record = self._flatten_osm_element(element)
@@ -78,6 +146,115 @@ def _collect_overpass(
                 self._collected_count += 1
                 yield record
 
+    def _collect_overpass_tiled(
+        self, url: str, query: str, tiling: dict
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Split the configured bbox into a grid and run the query once per tile,
+        a few tiles at a time. Tiles that time out or hit the element limit
+        are split into quadrants; elements on tile borders are yielded once.
+        """
+        try:
+            bbox = tuple(float(v) for v in tiling["bbox"])
+            if len(bbox) != 4:
+                raise ValueError
+        except (KeyError, TypeError, ValueError):
+            raise CollectionError(
+                "options.overpass_tiles.bbox must be [south, west, north, east]"
+            )
+        rows = max(1, int(tiling.get("rows", 4)))
+        cols = max(1, int(tiling.get("cols", 4)))
+        max_parallel = max(1, int(tiling.get("max_parallel", self.OVERPASS_TILE_PARALLEL)))
+        max_depth = max(0, int(tiling.get("max_depth", self.OVERPASS_TILE_DEPTH)))
+        element_limit = tiling.get("element_limit")
+
+        tiles = _tile_grid(bbox, rows, cols)
+        self.logger.info(
+            f"Running Overpass query over {len(tiles)} tiles "
+            f"({max_parallel} at a time): {query[:100]}..."
+        )
+
+        def fetch_tile(tile):
+            return self._fetch_overpass_tile(url, query, tile, max_depth, element_limit)
+
+        seen = set()
+        splits = duplicates = 0
+        try:
+            for elements, tile_splits in self._iter_parallel(fetch_tile, tiles, max_parallel):
+                splits += tile_splits
+                for element in elements:
+                    key = (element.get("type"), element.get("id"))
+                    if key in seen:
+                        duplicates += 1
+                        continue
+                    seen.add(key)
+                    record = self._flatten_osm_element(element)
+                    if record:
+                        self._collected_count += 1
+                        yield record
+        finally:
+            self.run_details["overpass_tiles"] = {
+                "tiles": len(tiles), "splits": splits, "duplicates": duplicates,
+            }
+
+    def _fetch_overpass_tile(
+        self,
+        url: str,
+        query: str,
+        bbox: Tuple[float, float, float, float],
+        depth_left: int,
+        element_limit: Optional[int] = None,
+    ) -> Tuple[List[dict], int]:
+        """
+        Fetch the elements of one tile, subdividing it when the query was
+        too big for it: a timeout (request timeout, 504 or a "timed out"
+        remark), an Overpass runtime error or a full element limit. Rate
+        limits, client errors and malformed responses are raised as they
+        are, since a smaller tile would fail the same way. Returns
+        (elements, number of splits).
+        """
+        try:
+            resp = self.fetch_url(url, method="POST", data={"data": _with_bbox(query, bbox)})
+        except RequestTimeout as e:
+            problem = str(e)
+        except CollectionError as e:
+            if e.status_code != 504:
+                raise
+            problem = str(e)
+        else:
+            try:
+                result = resp.json()
+            except ValueError as e:
+                raise CollectionError(f"Failed to parse Overpass response: {e}")
+            remark = result.get("remark") or ""
+            elements = result.get("elements", [])
+            if "runtime error" in remark or "timed out" in remark:
+                problem = remark
+            elif element_limit and len(elements) >= int(element_limit):
+                problem = f"{len(elements)} elements (limit {element_limit})"
+            else:
+                return elements, 0
+
+        if depth_left <= 0:
+            raise CollectionError(f"Overpass tile {bbox} failed: {problem}")
+
+        self.logger.info(f"Splitting Overpass tile {bbox}: {problem}")
+        elements, splits = [], 1
+        for quadrant in _split_bbox(bbox):
+            quad_elements, quad_splits = self._fetch_overpass_tile(
+                url, query, quadrant, depth_left - 1, element_limit
+            )
+            elements.extend(quad_elements)
+            splits += quad_splits
+        return elements, splits
+
+    def _get_overpass_query(self, params: dict) -> str:
+        """Return the configured Overpass QL query."""
+        query = params.get("data") or params.get("query", "")
+        if not query:
+            raise CollectionError("No Overpass query 'data' parameter configured.")
+        return query
+
     def _flatten_feature(self, feature: dict) -> Optional[Dict[str, Any]]:
         """
         Flatten a GeoJSON feature into a flat dict.
@@ -192,3 +369,43 @@ def to_geojson_collection(self, records: list) -> dict:
     def get_count(self) -> Optional[int]:
         """GeoJSON doesn't typically have a count endpoint."""
         return None
+
+
+def _tile_grid(
+    bbox: Tuple[float, float, float, float], rows: int, cols: int
+) -> List[Tuple[float, float, float, float]]:
+    """Split (south, west, north, east) into a rows x cols grid of tiles."""
+    south, west, north, east = bbox
+    lat_step = (north - south) / rows
+    lon_step = (east - west) / cols
+    return [
+        (
+            round(south + r * lat_step, 6), round(west + c * lon_step, 6),
+            round(south + (r + 1) * lat_step, 6), round(west + (c + 1) * lon_step, 6),
+        )
+        for r in range(rows)
+        for c in range(cols)
+    ]
+
+
+def _split_bbox(
+    bbox: Tuple[float, float, float, float]
+) -> List[Tuple[float, float, float, float]]:
+    """Split a tile into four quadrants."""
+    return _tile_grid(bbox, 2, 2)
+
+
+def _with_bbox(query: str, bbox: Tuple[float, float, float, float]) -> str:
+    """
+    Restrict an Overpass QL query to a bbox. A ``{{bbox}}`` placeholder is
+    substituted; otherwise a global ``[bbox:...]`` setting is added.
+    """
+    bbox_str = ",".join(f"{v:.6f}".rstrip("0").rstrip(".") for v in bbox)
+    if "{{bbox}}" in query:
+        return query.replace("{{bbox}}", bbox_str)
+    stripped = query.lstrip()
+    if stripped.startswith("["):
+        # Append to the existing settings statement, e.g. [out:json][timeout:60];
+        end = stripped.index(";") if ";" in stripped else len(stripped)
+        return f"{stripped[:end]}[bbox:{bbox_str}]{stripped[end:]}"
+    return f"[bbox:{bbox_str}];{query}"
@@ -0,0 +1,197 @@
+"""
+Incremental JSON parsing for large API / GeoJSON / Overpass responses.
+
+JSONRecordStream walks the top level of a JSON document as bytes arrive,
+finds the records array (a bare top-level array, or the first wrapper key
+such as ``features`` or ``elements``) and yields its items one at a time.
+Only the current item is ever fully materialized, so peak memory scales
+with record size rather than payload size.
+"""
+import codecs
+import json
+import logging
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence
+
+from .base import CollectionError
+
+logger = logging.getLogger(__name__)
+
+# Wrapper keys that hold the list of records, in APICollector._extract_records
+# priority order. "hits" may also be an Elasticsearch {"hits": {"hits": [...]}}.
+RECORD_WRAPPER_KEYS = (
+    "data", "results", "records", "items", "features", "hits", "elements",
+)
+
+_WHITESPACE = " \t\n\r"
+
+
+class JSONRecordStream:
+    """
+    Iterate over the records of a JSON document fed as byte chunks.
+
+    After iteration, ``record_key`` names the wrapper key that was streamed
+    (None for a bare top-level array) and ``document`` holds every other
+    top-level member, e.g. ``{"type": "FeatureCollection"}``. If no records
+    array was found, ``document`` is the whole decoded value.
+
+    Unlike _extract_records, which checks wrapper keys in priority order,
+    the first matching key in document order is streamed.
+    """
+
+    COMPACT_AT = 1024 * 1024  # Drop consumed text once this much has been read
+
+    def __init__(
+        self,
+        chunks: Iterable[bytes],
+        record_keys: Sequence[str] = RECORD_WRAPPER_KEYS,
+        encoding: str = "utf-8-sig",
+    ):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._json = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self.record_keys = tuple(record_keys)
+        self.record_key: Optional[str] = None
+        self.document: Any = None
+
+    def __iter__(self) -> Iterator[Any]:
+        ch = self._peek()
+        if ch == "[":
+            yield from self._iter_array()
+        elif ch == "{":
+            yield from self._iter_object()
+        elif ch is None:
+            raise CollectionError("Empty JSON response")
+        else:
+            self.document = self._read_value()
+        self._expect_end()
+
+    # ------------------------------------------------------------------
+    # Document structure
+    # ------------------------------------------------------------------
+
+    def _iter_object(self) -> Iterator[Any]:
+        """Walk top-level members, streaming the first records array."""
+        self.document = {}
+        self._pos += 1  # "{"
+        for key in self._iter_keys():
+            ch = self._peek()
+            if self.record_key is None and key in self.record_keys and ch == "[":
+                self.record_key = key
+                yield from self._iter_array()
+            elif self.record_key is None and key == "hits" and ch == "{":
+                yield from self._iter_es_hits()
+            else:
+                self.document[key] = self._read_value()
+
+    def _iter_es_hits(self) -> Iterator[Any]:
+        """Stream Elasticsearch-style {"hits": {"hits": [{"_source": ...}]}}."""
+        outer = {}
+        self._pos += 1  # "{"
+        for key in self._iter_keys():
+            if self.record_key is None and key == "hits" and self._peek() == "[":
+                self.record_key = "hits.hits"
+                for hit in self._iter_array():
+                    yield hit.get("_source", hit) if isinstance(hit, dict) else hit
+            else:
+                outer[key] = self._read_value()
+        self.document["hits"] = outer
+
+    def _iter_keys(self) -> Iterator[str]:
+        """Yield object keys, leaving the position at each member's value."""
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._read_value()
+            if not isinstance(key, str):
+                raise CollectionError("Invalid JSON: object key is not a string")
+            self._expect(":")
+            yield key
+            ch = self._peek()
+            self._pos += 1
+            if ch == "}":
+                return
+            if ch != ",":
+                raise CollectionError(f"Invalid JSON: expected ',' or '}}', got {ch!r}")
+
+    def _iter_array(self) -> Iterator[Any]:
+        """Yield the items of the array at the current position."""
+        self._pos += 1  # "["
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._read_value()
+            ch = self._peek()
+            self._pos += 1
+            if ch == "]":
+                return
+            if ch != ",":
+                raise CollectionError(f"Invalid JSON: expected ',' or ']', got {ch!r}")
+
+    # ------------------------------------------------------------------
+    # Buffer handling
+    # ------------------------------------------------------------------
+
+    def _fill(self) -> bool:
+        """Append the next decoded chunk to the buffer. False at EOF."""
+        if self._eof:
+            return False
+        if self._pos >= self.COMPACT_AT:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self._buf += text
+                return True
+        self._buf += self._decoder.decode(b"", final=True)
+        self._eof = True
+        return False
+
+    def _peek(self) -> Optional[str]:
+        """Skip whitespace and return the next character (None at EOF)."""
+        while True:
+            buf = self._buf
+            while self._pos < len(buf) and buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(buf):
+                return buf[self._pos]
+            if not self._fill():
+                return None
+
+    def _expect(self, char: str) -> None:
+        ch = self._peek()
+        if ch != char:
+            raise CollectionError(f"Invalid JSON: expected {char!r}, got {ch!r}")
+        self._pos += 1
+
+    def _expect_end(self) -> None:
+        if self._peek() is not None:
+            raise CollectionError("Invalid JSON: unexpected data after document")
+
+    def _read_value(self) -> Any:
+        """
+        Decode one complete JSON value at the current position, reading
+        more input until it is complete. A value ending exactly at the end
+        of the buffer (e.g. a number) is only trusted once input is at EOF.
+        """
+        if self._peek() is None:
+            raise CollectionError("Invalid JSON: unexpected end of data")
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buf, self._pos)
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self._eof:
+                    raise CollectionError(f"Failed to parse JSON response: {e}")
+            # Incomplete: read until the unread part has at least doubled
+            target = max(len(self._buf) - self._pos, 1) * 2
+            while len(self._buf) - self._pos < target and self._fill():
+                pass
+
@@ -0,0 +1,209 @@
+"""
+Process-wide, per-host token-bucket rate limiting.
+
+Every collector in the process draws from the same bucket for a host, so two
+sources on data.ny.gov share one budget instead of each assuming the full
+rate. Each host gets a short-term bucket (requests_per_minute with a burst of
+burst_allowance) and an hourly bucket (requests_per_hour). A 429/503 with
+Retry-After blocks the whole host for that long.
+
+Limits come from the ``rate_limiting`` section of config/settings.yaml:
+
+    rate_limiting:
+      default_requests_per_minute: 60
+      default_requests_per_hour: 1000
+      burst_allowance: 10
+      hosts:
+        data.ny.gov: {requests_per_minute: 120, requests_per_hour: 5000}
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from src.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at ``rate`` tokens/second up to ``capacity``.
+    Tokens may go negative: each caller reserves its slot and waits out the
+    deficit, so concurrent threads queue up in order without holding a lock
+    while they sleep.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, now: float) -> float:
+        """Take one token; return seconds until it is actually available."""
+        self._refill(now)
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until the next token would be available (no reservation)."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def drain(self, now: float, seconds: float) -> None:
+        """Empty the bucket so the next token is at least ``seconds`` away."""
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+
+class HostRateLimiter:
+    """Rate limit state for one host."""
+
+    def __init__(
+        self,
+        host: str,
+        requests_per_minute: float = 60,
+        requests_per_hour: float = 1000,
+        burst_allowance: int = 10,
+    ):
+        self.host = host
+        self.buckets: List[TokenBucket] = []
+        if requests_per_minute and requests_per_minute > 0:
+            self.buckets.append(TokenBucket(requests_per_minute / 60.0, burst_allowance))
+        if requests_per_hour and requests_per_hour > 0:
+            self.buckets.append(TokenBucket(requests_per_hour / 3600.0, requests_per_hour))
+        self.blocked_until = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Reserve a request slot; return how long the caller must wait first."""
+        with self._lock:
+            now = time.monotonic()
+            wait = max([b.reserve(now) for b in self.buckets] or [0.0])
+            wait = max(wait, self.blocked_until - now)
+            self.requests += 1
+            self.total_wait += wait
+            return wait
+
+    def penalize(self, seconds: float) -> None:
+        """Block the host for ``seconds`` (from Retry-After or backoff)."""
+        with self._lock:
+            now = time.monotonic()
+            self.throttled += 1
+            self.blocked_until = max(self.blocked_until, now + seconds)
+            for bucket in self.buckets:
+                bucket.drain(now, seconds)
+
+    def current_wait(self) -> float:
+        """Seconds a new request to this host would wait right now."""
+        with self._lock:
+            now = time.monotonic()
+            wait = max([b.wait_time(now) for b in self.buckets] or [0.0])
+            return max(wait, self.blocked_until - now, 0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "host": self.host,
+            "wait_seconds": round(self.current_wait(), 3),
+            "blocked_for_seconds": round(max(0.0, self.blocked_until - time.monotonic()), 3),
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "total_wait_seconds": round(self.total_wait, 3),
+        }
+
+
+class RateLimiterRegistry:
+    """Process-wide map of host -> HostRateLimiter."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config if config is not None else (get_setting("rate_limiting") or {})
+        self._limiters: Dict[str, HostRateLimiter] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def burst_allowance(self) -> int:
+        return int(self.config.get("burst_allowance", 10))
+
+    def for_url(self, url: str) -> HostRateLimiter:
+        host = (urlsplit(url).hostname or "").lower()
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.get(host)
+                if limiter is None:
+                    limiter = self._limiters[host] = self._build(host)
+        return limiter
+
+    def _build(self, host: str) -> HostRateLimiter:
+        cfg = self.config
+        overrides = (cfg.get("hosts") or {}).get(host) or {}
+        return HostRateLimiter(
+            host,
+            requests_per_minute=float(overrides.get(
+                "requests_per_minute", cfg.get("default_requests_per_minute", 60))),
+            requests_per_hour=float(overrides.get(
+                "requests_per_hour", cfg.get("default_requests_per_hour", 1000))),
+            burst_allowance=int(overrides.get(
+                "burst_allowance", cfg.get("burst_allowance", 10))),
+        )
+
+    def reserve(self, url: str) -> float:
+        """Reserve a slot for ``url``'s host; return seconds to wait."""
+        return self.for_url(url).reserve()
+
+    def acquire(self, url: str) -> float:
+        """Block until a request to ``url``'s host is allowed; return seconds waited."""
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def penalize(self, url: str, seconds: float) -> None:
+        self.for_url(url).penalize(seconds)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Current wait time and counters for every host seen so far."""
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return [limiter.stats() for limiter in sorted(limiters, key=lambda l: l.host)]
+
+
+_registry: Optional[RateLimiterRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiterRegistry:
+    """Return the process-wide rate limiter registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = RateLimiterRegistry()
+    return _registry
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,289 @@
+"""
+Compressed raw-response archive and offline replay.
+
+Every HTTP response a collector receives during a run is appended to one
+compressed file under ``storage.raw_data_dir`` (zstd if the optional
+``zstandard`` package is installed, otherwise gzip). The file is a sequence
+of frames, each a JSON header line optionally followed by raw bytes:
+
+    {"type": "meta", ...}                       run/source information
+    {"type": "response", "seq": 3, ...}         request + status + headers
+    {"type": "chunk", "seq": 3, "length": N}    N body bytes follow
+    {"type": "end", "seq": 3, "bytes": M}       end of that response body
+
+Each response is one page, so page boundaries and headers survive. Streamed
+bodies are archived as the collector consumes them, and chunks of
+concurrently fetched pages may interleave (they are tagged by ``seq``).
+
+RawArchiveReader turns an archive back into requests.Response objects so a
+collector can be re-run against it with no network access.
+"""
+import gzip
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Any, BinaryIO, Collection, Dict, List, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from src.settings import PROJECT_ROOT, get_setting
+from .base import CollectionError
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Body is archived decoded, so transfer-level headers no longer apply
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+def raw_data_dir() -> str:
+    """Absolute path of ``storage.raw_data_dir`` (relative to the project root)."""
+    path = get_setting("storage.raw_data_dir", os.path.join("data", "raw"))
+    return path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
+
+
+def request_key(method: str, url: str, params: Any = None, data: Any = None) -> str:
+    """Identify a request by method, URL, sorted params and form data."""
+    return json.dumps(
+        [
+            (method or "GET").upper(),
+            url,
+            sorted((str(k), str(v)) for k, v in (params or {}).items()),
+            sorted((str(k), str(v)) for k, v in data.items())
+            if isinstance(data, dict) else data,
+        ],
+        default=str,
+    )
+
+
+def _without(params: Any, keys: Collection[str]) -> Any:
+    """``params`` minus the ``keys`` whose values change between runs."""
+    if not isinstance(params, dict):
+        return params
+    return {k: v for k, v in params.items() if k not in keys}
+
+
+def _open_compressed(path: str, mode: str) -> BinaryIO:
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise CollectionError(f"Reading {path} requires the 'zstandard' package")
+        raw = open(path, mode)
+        if "w" in mode:
+            return zstandard.ZstdCompressor(level=6).stream_writer(raw, closefd=True)
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True))
+    return gzip.open(path, mode, compresslevel=6) if "w" in mode else gzip.open(path, mode)
+
+
+class RawArchiveWriter:
+    """Append a run's HTTP responses to a compressed archive file."""
+
+    def __init__(self, path: str, meta: Optional[Dict[str, Any]] = None):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.responses = 0
+        self.bytes_written = 0
+        self._file = _open_compressed(path, "wb")
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._frame({"type": "meta", "created_at": datetime.utcnow().isoformat(),
+                     **(meta or {})})
+
+    @classmethod
+    def for_run(cls, source_id: str, run_id: int, meta: Optional[Dict[str, Any]] = None):
+        """Create the archive file for a run under raw_data_dir/<source_id>/."""
+        compression = get_setting("storage.raw_compression", "auto")
+        use_zstd = zstandard is not None and compression in ("auto", "zstd")
+        if compression == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed; archiving raw responses with gzip")
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        name = f"{stamp}_run{run_id}.rawlog" + (".zst" if use_zstd else ".gz")
+        return cls(
+            os.path.join(raw_data_dir(), source_id, name),
+            {"source_id": source_id, "run_id": run_id, **(meta or {})},
+        )
+
+    def _frame(self, header: Dict[str, Any], body: bytes = b"") -> None:
+        if self._file is None:
+            return  # A streamed body read after the run finished
+        line = json.dumps(header, default=str).encode("utf-8") + b"\n"
+        self._file.write(line + body)
+        self.bytes_written += len(body)
+
+    def record(self, method: str, url: str, params: Any, data: Any,
+               resp: requests.Response, streamed: bool = False) -> requests.Response:
+        """
+        Archive ``resp``. Loaded bodies are written at once; for streamed
+        responses iter_content is wrapped so chunks are archived as read.
+        """
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            self.responses += 1
+            self._frame({
+                "type": "response", "seq": seq, "method": method.upper(), "url": url,
+                "params": params, "data": data, "status": resp.status_code,
+                "final_url": resp.url,
+                "headers": {k: v for k, v in resp.headers.items()
+                            if k.lower() not in _DROP_HEADERS},
+            })
+            if not streamed:
+                body = resp.content or b""
+                self._frame({"type": "chunk", "seq": seq, "length": len(body)}, body)
+                self._frame({"type": "end", "seq": seq, "bytes": len(body)})
+                return resp
+
+        read_content = resp.iter_content
+
+        def tee(chunk_size):
+            total = 0
+            for chunk in read_content(chunk_size):
+                if chunk:
+                    total += len(chunk)
+                    with self._lock:
+                        self._frame({"type": "chunk", "seq": seq, "length": len(chunk)}, chunk)
+                yield chunk
+            with self._lock:
+                self._frame({"type": "end", "seq": seq, "bytes": total})
+
+        def iter_content(chunk_size=1, decode_unicode=False):
+            chunks = tee(chunk_size)
+            if decode_unicode:
+                return requests.utils.stream_decode_response_unicode(chunks, resp)
+            return chunks
+
+        resp.iter_content = iter_content
+        return resp
+
+    @property
+    def relative_path(self) -> str:
+        """Path to store on the run: relative to the project root when inside it."""
+        rel = os.path.relpath(self.path, PROJECT_ROOT)
+        return self.path if rel.startswith("..") else rel
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class _ArchivedResponse:
+    """One archived response; the body is spooled to disk past 8 MB."""
+
+    def __init__(self, header: Dict[str, Any]):
+        self.header = header
+        self.key = request_key(header.get("method"), header.get("url"),
+                               header.get("params"), header.get("data"))
+        self.body = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        self.complete = False
+        self.consumed = False
+
+    def loose_key(self, volatile: Collection[str]) -> str:
+        """request_key with the ``volatile`` params left out."""
+        header = self.header
+        return request_key(header.get("method"), header.get("url"),
+                           _without(header.get("params"), volatile), header.get("data"))
+
+    def to_response(self) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = self.header.get("status", 200)
+        resp.headers = CaseInsensitiveDict(self.header.get("headers") or {})
+        resp.url = self.header.get("final_url") or self.header.get("url")
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+        self.body.seek(0)
+        resp.raw = self.body
+        return resp
+
+
+class RawArchiveReader:
+    """
+    Serve archived responses in place of network requests.
+
+    Responses are matched by request (method, URL, params, data). The
+    collector names the params that depend on the moment of collection
+    (incremental watermarks, keyset cursors); a request that differs from
+    an archived one only in those falls back to the first unused such
+    response in recorded order. Any other request raises CollectionError.
+    """
+
+    def __init__(self, path: str):
+        if path and not os.path.isabs(path):
+            path = os.path.join(PROJECT_ROOT, path)
+        if not path or not os.path.exists(path):
+            raise CollectionError(f"Raw archive not found: {path}")
+        self.path = path
+        self.meta: Dict[str, Any] = {}
+        self._responses: List[_ArchivedResponse] = []
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        by_seq: Dict[int, _ArchivedResponse] = {}
+        with _open_compressed(self.path, "rb") as f:
+            while True:
+                line = f.readline()
+                if not line:
+                    break
+                try:
+                    header = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Truncated raw archive {self.path}")
+                    break
+                kind = header.get("type")
+                if kind == "meta":
+                    self.meta = header
+                elif kind == "response":
+                    entry = by_seq[header["seq"]] = _ArchivedResponse(header)
+                    self._responses.append(entry)
+                elif kind == "chunk":
+                    body = f.read(header["length"])
+                    by_seq[header["seq"]].body.write(body)
+                elif kind == "end":
+                    by_seq[header["seq"]].complete = True
+
+    @property
+    def response_count(self) -> int:
+        return len(self._responses)
+
+    def response_for(self, method: str, url: str, params: Any = None,
+                     data: Any = None,
+                     volatile: Collection[str] = ()) -> requests.Response:
+        """
+        The archived response to this request. ``volatile`` lists the param
+        keys that may differ from the recorded request.
+        """
+        key = request_key(method, url, params, data)
+        with self._lock:
+            pending = [r for r in self._responses if not r.consumed]
+            if not pending:
+                raise CollectionError(f"Raw archive has no response left for {method} {url}")
+            entry = next((r for r in pending if r.key == key), None)
+            if entry is None and volatile:
+                loose = request_key(method, url, _without(params, volatile), data)
+                entry = next((r for r in pending if r.loose_key(volatile) == loose), None)
+                if entry is not None:
+                    logger.warning(
+                        f"Replaying {entry.header.get('url')} params={entry.header.get('params')} "
+                        f"for {url} params={params} (differs only in {sorted(volatile)})"
+                    )
+            if entry is None:
+                raise CollectionError(
+                    f"Raw archive has no response for {method} {url} params={params}"
+                )
+            entry.consumed = True
+        if not entry.complete:
+            logger.warning(f"Archived response {entry.header.get('url')} is incomplete")
+        return entry.to_response()
+
+    def close(self) -> None:
+        for entry in self._responses:
+            entry.body.close()
@@ -0,0 +1,170 @@
+"""
+Process-wide registry of pooled requests sessions.
+
+Collectors used to build (and on close() throw away) their own
+requests.Session, so every run paid for fresh TCP/TLS handshakes. Sessions
+are now shared per origin (scheme + host) and header fingerprint (user agent,
+app token / bearer auth and custom headers), so back-to-back runs against the
+same Socrata domain reuse warm keep-alive connections. Sessions differing in
+credentials never share a connection pool.
+"""
+import hashlib
+import json
+import logging
+import socket
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+from src.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+# TCP keep-alive probes so idle pooled connections behind NAT/load balancers
+# are detected instead of failing on the next request
+_KEEPALIVE_OPTIONS = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+for _name, _value in (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 15), ("TCP_KEEPCNT", 4)):
+    if hasattr(socket, _name):
+        _KEEPALIVE_OPTIONS.append((socket.IPPROTO_TCP, getattr(socket, _name), _value))
+
+
+class KeepAliveHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter with TCP keep-alive enabled on pooled sockets."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault(
+            "socket_options", HTTPConnection.default_socket_options + _KEEPALIVE_OPTIONS
+        )
+        super().init_poolmanager(*args, **kwargs)
+
+    def pool_stats(self) -> Tuple[int, int]:
+        """(requests sent, connections opened) across this adapter's live pools."""
+        requests_sent = connections = 0
+        pools = self.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                requests_sent += getattr(pool, "num_requests", 0)
+                connections += getattr(pool, "num_connections", 0)
+        return requests_sent, connections
+
+
+class _PooledSession:
+    """A shared session plus the adapter settings it was built with."""
+
+    def __init__(self, origin: str, fingerprint: str, headers: Dict[str, str],
+                 retry, pool_size: int):
+        self.origin = origin
+        self.fingerprint = fingerprint
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        self.retry = retry
+        self.pool_size = 0
+        self.adapters: List[KeepAliveHTTPAdapter] = []
+        self.mount(pool_size)
+
+    def mount(self, pool_size: int) -> None:
+        """(Re)mount an adapter with at least ``pool_size`` connections per host."""
+        adapter = KeepAliveHTTPAdapter(
+            max_retries=self.retry, pool_connections=10, pool_maxsize=pool_size
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Replaced adapters stay referenced so in-flight requests and their
+        # counters survive a resize
+        self.adapters.append(adapter)
+        self.pool_size = pool_size
+
+    def stats(self) -> Dict[str, Any]:
+        sent = opened = 0
+        for adapter in self.adapters:
+            s, o = adapter.pool_stats()
+            sent += s
+            opened += o
+        return {
+            "origin": self.origin,
+            "fingerprint": self.fingerprint[:12],
+            "pool_maxsize": self.pool_size,
+            "requests": sent,
+            "connections_opened": opened,
+            "connections_reused": max(0, sent - opened),
+            "reuse_ratio": round((sent - opened) / sent, 3) if sent else None,
+        }
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class SessionRegistry:
+    """Hands out one shared requests.Session per (origin, header fingerprint)."""
+
+    def __init__(self, default_pool_size: Optional[int] = None):
+        self.default_pool_size = int(
+            default_pool_size or get_setting("collection.http_pool_size", 20)
+        )
+        self._entries: Dict[Tuple[str, str], _PooledSession] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, headers: Dict[str, str], retry, pool_size: int = 0) -> requests.Session:
+        """
+        Return the shared session for ``url``'s origin and ``headers``,
+        growing its connection pool to ``pool_size`` if needed.
+        """
+        origin = _origin(url)
+        fingerprint = _fingerprint(headers)
+        pool_size = max(self.default_pool_size, pool_size)
+        key = (origin, fingerprint)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _PooledSession(origin, fingerprint, headers, retry, pool_size)
+                self._entries[key] = entry
+                logger.debug(f"New HTTP session for {origin} (pool {pool_size})")
+            elif pool_size > entry.pool_size:
+                entry.mount(pool_size)
+            return entry.session
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Connection reuse counters for every shared session."""
+        with self._lock:
+            entries = list(self._entries.values())
+        return [e.stats() for e in sorted(entries, key=lambda e: e.origin)]
+
+    def close_all(self) -> None:
+        """Close every pooled connection (e.g. on shutdown)."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            entry.close()
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url or "")
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+
+def _fingerprint(headers: Dict[str, str]) -> str:
+    """Stable hash of the session headers (includes credentials, never logged)."""
+    canonical = json.dumps(
+        sorted((str(k).lower(), str(v)) for k, v in headers.items())
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+_registry: Optional[SessionRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_session_registry() -> SessionRegistry:
+    """Return the process-wide session registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = SessionRegistry()
+    return _registry
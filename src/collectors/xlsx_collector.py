@@ -0,0 +1,142 @@
+"""
+Excel collector - reads ``.xlsx`` workbooks row by row.
+"""
+import logging
+import zipfile
+from datetime import date, datetime, time
+from typing import Generator, Dict, Any, BinaryIO, Iterable, List, Optional
+
+import openpyxl
+from openpyxl.utils.exceptions import InvalidFileException
+
+from .base import CollectionError
+from .csv_collector import CSVCollector
+
+logger = logging.getLogger(__name__)
+
+
+class XLSXCollector(CSVCollector):
+    """
+    Collects data from Excel (``.xlsx``) workbooks.
+    Features:
+    - The workbook is downloaded to the download cache (resumable, like
+      large CSVs) and never loaded whole: openpyxl's read-only mode parses
+      the sheet XML as rows are iterated
+    - Header normalization identical to CSV sources
+    - Cells are returned as strings like CSV cells; dates become ISO strings
+
+    ``options.sheet`` picks the worksheet by name or 0-based index (default:
+    the first sheet). ``options.header_row`` is the 1-based row holding the
+    column names (default: the first non-empty row). Columns without a
+    header, such as formatted but empty trailing columns, are dropped.
+    """
+
+    def collect(self) -> Generator[Dict[str, Any], None, None]:
+        """Yield the data rows of the selected worksheet."""
+        resume = self._resume_point("xlsx")
+        self.logger.info(f"Downloading workbook from: {self._get_url()}")
+        with self._download_file() as cache:
+            with open(cache.path, "rb") as f:
+                yield from self._parse_workbook(f, resume)
+            cache.discard()
+
+    def _preview_records(self, n: int) -> Generator[Dict[str, Any], None, None]:
+        """An xlsx is a zip: read its index and the sheet with Range requests."""
+        with self._open_for_preview() as f:
+            yield from self._parse_workbook(f)
+
+    def get_checkpoint(self) -> Dict[str, Any]:
+        return dict(self.checkpoint)
+
+    def _parse_workbook(
+        self, fileobj: BinaryIO, resume: Optional[Dict[str, Any]] = None
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Parse one worksheet of a workbook (a seekable binary file) into row
+        dicts. ``resume`` is an xlsx checkpoint for the same sheet.
+        """
+        try:
+            workbook = openpyxl.load_workbook(fileobj, read_only=True, data_only=True)
+        except (InvalidFileException, zipfile.BadZipFile, KeyError) as e:
+            raise CollectionError(f"Not a valid .xlsx workbook: {e}")
+
+        try:
+            sheet = self._select_sheet(workbook)
+            # Some exporters write a wrong <dimension>; read every row instead
+            sheet.reset_dimensions()
+            rows = sheet.iter_rows(values_only=True)
+            fieldnames = self._read_header(rows)
+            if fieldnames is None:
+                return
+
+            skip = 0
+            if resume and resume.get("sheet") == sheet.title:
+                skip = int(resume.get("skip", 0))
+            yield from self._checkpoint_records(
+                self._rows_to_records(rows, fieldnames), {"type": "xlsx", "sheet": sheet.title}, skip,
+            )
+        except CollectionError:
+            raise
+        except Exception as e:
+            raise CollectionError(f"Excel parsing error: {e}")
+        finally:
+            workbook.close()
+
+    def _select_sheet(self, workbook):
+        """The worksheet named or indexed by options.sheet (default: the first)."""
+        choice = self._get_options().get("sheet")
+        if choice is None:
+            return workbook.worksheets[0]
+        if isinstance(choice, int):
+            if not 0 <= choice < len(workbook.worksheets):
+                raise CollectionError(
+                    f"Workbook has {len(workbook.worksheets)} sheets; sheet index {choice} is out of range"
+                )
+            return workbook.worksheets[choice]
+        if choice not in workbook.sheetnames:
+            raise CollectionError(
+                f"Sheet {choice!r} not found (sheets: {', '.join(workbook.sheetnames)})"
+            )
+        return workbook[choice]
+
+    def _read_header(self, rows: Iterable[tuple]) -> Optional[List[Optional[str]]]:
+        """
+        Consume rows up to and including the header row and return the
+        normalized column names (None for columns without a header).
+        """
+        header_row = self._get_options().get("header_row")
+        for number, row in enumerate(rows, start=1):
+            if header_row is not None:
+                if number < int(header_row):
+                    continue
+            elif not any(_cell_text(v) for v in row):
+                continue
+            return [
+                self._normalize_header(_cell_text(v)) if _cell_text(v) else None
+                for v in row
+            ]
+        self.logger.warning("Worksheet has no header row")
+        return None
+
+    def _rows_to_records(
+        self, rows: Iterable[tuple], fieldnames: List[Optional[str]]
+    ) -> Generator[Dict[str, Any], None, None]:
+        for row in rows:
+            record = {
+                name: _cell_text(value)
+                for name, value in zip(fieldnames, row) if name
+            }
+            # Skip empty rows (and trailing formatted-but-empty rows)
+            if any(record.values()):
+                yield record
+
+
+def _cell_text(value: Any) -> str:
+    """Render a cell value the way a CSV export of the sheet would."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return str(value)
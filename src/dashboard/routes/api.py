@@ -102,6 +102,7 @@ def create_source():
             headers=data.get("headers"),
             pagination=data.get("pagination"),
             field_mapping=data.get("field_mapping"),
+            options=data.get("options"),
             tags=data.get("tags", []),
             notes=data.get("notes"),
             rate_limit_rpm=data.get("rate_limit_rpm", 60),
@@ -128,7 +129,7 @@ def update_source(source_id: int):
             "name", "description", "state", "agency", "category", "subcategory",
             "format", "url", "discovery_url", "website", "enabled",
             "api_key_required", "api_key_env", "params", "headers",
-            "pagination", "field_mapping", "tags", "notes",
+            "pagination", "field_mapping", "options", "tags", "notes",
             "rate_limit_rpm", "timeout",
         ]
         for field in updatable:
@@ -184,6 +185,19 @@ def test_source(source_id: int):
     return jsonify({"success": success, "message": message})
 
 
+@api_bp.route("/sources/<int:source_id>/preview", methods=["POST"])
+def preview_source(source_id: int):
+    """POST /api/sources/:id/preview?n=20 - First records and suggested field_mapping."""
+    from src.scheduler.manager import preview_source as run_preview
+    n = request.args.get("n", type=int)
+    try:
+        return jsonify(run_preview(source_id, n))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 @api_bp.route("/sources/<int:source_id>/run", methods=["POST"])
 def run_source(source_id: int):
     """POST /api/sources/:id/run - Manually trigger collection."""
@@ -587,6 +601,20 @@ def list_jobs():
     return jsonify([])
 
 
+@api_bp.route("/rate-limits", methods=["GET"])
+def rate_limits():
+    """GET /api/rate-limits - Current wait time and throttle counters per host."""
+    from src.collectors.rate_limiter import get_rate_limiter
+    return jsonify(get_rate_limiter().stats())
+
+
+@api_bp.route("/http-sessions", methods=["GET"])
+def http_sessions():
+    """GET /api/http-sessions - Connection pool reuse stats per shared session."""
+    from src.collectors.session_pool import get_session_registry
+    return jsonify(get_session_registry().stats())
+
+
 @api_bp.route("/scheduler/sync", methods=["POST"])
 def scheduler_sync():
     """POST /api/scheduler/sync - Sync DB schedules to APScheduler."""
@@ -4,8 +4,14 @@
 """
 import logging
 import re
+from collections import OrderedDict
 from datetime import datetime, date
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, FrozenSet, Iterable, List, NamedTuple, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency: normalize_batch converts per value
+    np = None
 
 logger = logging.getLogger(__name__)
 
@@ -20,19 +26,175 @@
     "district", "period_year", "period_month", "amount",
 }
 
+# Source column names commonly used for a standard field, beyond the
+# spelling variations generated by _field_name_variations
+FIELD_ALIASES = {
+    "name": ["dba", "business_name", "tradename", "license_name",
+             "dispensary_name", "facility_name", "applicant_name"],
+    "license_number": ["license_no", "ubi", "license_id", "permit_number",
+                       "lic_no", "license"],
+    "license_type": ["type", "privilege", "category", "permit_type"],
+    "license_status": ["status", "license_status"],
+    "address": ["street", "street_address", "premise_address",
+                "physicaladdress", "physical_address"],
+    "city": ["premise_city", "city_town", "physicalcity"],
+    "zip_code": ["zip", "postal_code", "zipcode", "premise_zip",
+                 "physicalzip"],
+    "county": ["borough", "parish"],
+    "latitude": ["lat", "y", "ylat"],
+    "longitude": ["lon", "lng", "long", "x", "xlong"],
+    "phone": ["telephone", "phone_number", "contact_phone"],
+    "website": ["url", "web", "web_address"],
+    "license_date": ["issued", "issue_date", "issueddate",
+                     "effective_date", "licenseissuedate"],
+    "expiry_date": ["expires", "expiration_date", "expiration",
+                    "expirationdate", "licenseexpirationdate"],
+}
+
+STATE_ABBREVIATIONS = {
+    "alaska": "AK", "arizona": "AZ", "arkansas": "AR",
+    "california": "CA", "colorado": "CO", "connecticut": "CT",
+    "delaware": "DE", "florida": "FL", "georgia": "GA",
+    "hawaii": "HI", "idaho": "ID", "illinois": "IL",
+    "indiana": "IN", "iowa": "IA", "kansas": "KS",
+    "kentucky": "KY", "louisiana": "LA", "maine": "ME",
+    "maryland": "MD", "massachusetts": "MA", "michigan": "MI",
+    "minnesota": "MN", "mississippi": "MS", "missouri": "MO",
+    "montana": "MT", "nebraska": "NE", "nevada": "NV",
+    "new hampshire": "NH", "new jersey": "NJ", "new mexico": "NM",
+    "new york": "NY", "north carolina": "NC", "north dakota": "ND",
+    "ohio": "OH", "oklahoma": "OK", "oregon": "OR",
+    "pennsylvania": "PA", "rhode island": "RI", "south carolina": "SC",
+    "south dakota": "SD", "tennessee": "TN", "texas": "TX",
+    "utah": "UT", "vermont": "VT", "virginia": "VA",
+    "washington": "WA", "west virginia": "WV", "wisconsin": "WI",
+    "wyoming": "WY", "district of columbia": "DC",
+}
+
+DATE_FIELDS = ("record_date", "license_date", "expiry_date")
+DATE_FORMATS = (
+    "%Y-%m-%d", "%m/%d/%Y", "%m-%d-%Y",
+    "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d",
+    "%m/%d/%y", "%d-%b-%Y", "%B %d, %Y",
+)
+# Formats that read the same digits with day and month swapped
+_DAY_MONTH_SWAPS = (("%m/%d/%Y", "%d/%m/%Y"), ("%m-%d-%Y", "%d-%m-%Y"))
+_NULL_DATES = frozenset(("n/a", "none", "null"))
+# Raw objects the coordinates may be nested in (Socrata location columns)
+LOCATION_KEYS = ("location", "geolocation", "coordinates", "point")
+
+_NULL_STRINGS = frozenset(("", "n/a", "na", "null", "none", "-", "unknown"))
+_NON_DIGITS = re.compile(r"\D")
+_NON_DIGITS_OR_SEP = re.compile(r"[^\d\x00]")  # \x00 separates values in a joined column
+_ISO_DATE = re.compile(r"([0-9]{4})-([0-9]{2})-([0-9]{2})")
+
+
+class _Plan(NamedTuple):
+    """Where each standard field is read from for one raw key set."""
+    mapped: Tuple[Tuple[str, str, bool], ...]   # (std_field, source key/path, dotted)
+    detected: Tuple[Tuple[str, str], ...]       # (std_field, auto-detected raw key)
+
+
+class _DateColumn:
+    """
+    Date parsing state for one field. Before any value is parsed, the
+    formats are ordered by how many of a sample of the field's values (up
+    to LEARN_SAMPLE distinct ones) each matches; ties keep the DATE_FORMATS
+    order. The order never changes afterwards, so a string maps to the same
+    date for the whole run. A field whose sample matched a format and its
+    day/month swap equally often is flagged as ambiguous. Results are kept
+    in an LRU of CACHE_SIZE strings.
+    """
+
+    LEARN_SAMPLE = 20
+    CACHE_SIZE = 4096
+
+    def __init__(self, preferred: Optional[str] = None, learned: Optional[List[str]] = None):
+        self.formats = list(learned or DATE_FORMATS)
+        if preferred:
+            # A configured format is tried first and nothing is learned
+            if preferred in self.formats:
+                self.formats.remove(preferred)
+            self.formats.insert(0, preferred)
+        self.learned = bool(preferred or learned)
+        self.seen = False  # Any value of the field was parsed
+        self.ambiguous = False
+        self.warned = False
+        self.cache: "OrderedDict[str, Optional[date]]" = OrderedDict()
+
+    def learn(self, values: Iterable[str]) -> None:
+        """
+        Order the formats by how many sample values each one parses. Values
+        no format parses are not counted; if none parse, nothing is learned.
+        """
+        counts = dict.fromkeys(self.formats, 0)
+        sample = set()
+        for value in values:
+            text = _date_text(value)
+            if text in sample:
+                continue
+            matched = [fmt for fmt in self.formats if _parse_date_format(text, fmt) is not None]
+            if not matched:
+                continue
+            sample.add(text)
+            for fmt in matched:
+                counts[fmt] += 1
+            if len(sample) >= self.LEARN_SAMPLE:
+                break
+        if not sample:
+            return
+        self.formats.sort(key=lambda fmt: -counts[fmt])
+        self.ambiguous = any(counts[a] == counts[b] > 0 for a, b in _DAY_MONTH_SWAPS)
+        self.learned = True
+
+    def parse(self, date_str: str) -> Optional[date]:
+        cache = self.cache
+        if date_str in cache:
+            cache.move_to_end(date_str)
+            return cache[date_str]
+
+        self.seen = True
+        if not self.learned:
+            # Without a sample (see RecordNormalizer.learn_date_formats) the
+            # first value decides
+            self.learn((date_str,))
+        text = _date_text(date_str)
+        parsed = None
+        for fmt in self.formats:
+            parsed = _parse_date_format(text, fmt)
+            if parsed is not None:
+                break
+
+        cache[date_str] = parsed
+        if len(cache) > self.CACHE_SIZE:
+            cache.popitem(last=False)
+        return parsed
+
 
 class RecordNormalizer:
     """
     Normalizes raw collected records into the standard schema.
     Uses the field_mapping from a DataSource configuration to
     translate source-specific field names to standard names.
+
+    Field lookups are compiled into a plan per raw key set the first time
+    it is seen, so per-record work is plain dict access.
     """
 
+    MAX_PLANS = 256  # Distinct key sets remembered before the cache is reset
+
     def __init__(self, source):
         self.source = source
         self.source_state = getattr(source, "state", None)
         self.source_category = getattr(source, "category", None)
         self.field_mapping = self._build_field_mapping(source)
+        # Compiled plans keyed by the raw record key set (see _plan_for)
+        self._plans: Dict[FrozenSet[str], _Plan] = {}
+        self._last_keys: FrozenSet[str] = frozenset()
+        self._last_plan: Optional[_Plan] = None
+        # Learned date formats and parsed values per date field
+        self._date_columns: Dict[Optional[str], _DateColumn] = {}
+        self._learn_dates = True
 
     def _build_field_mapping(self, source) -> Dict[str, str]:
         """Build field mapping: standard_name -> source_field_name."""
@@ -45,41 +207,104 @@ def normalize(self, raw: Dict[str, Any]) -> Dict[str, Any]:
         Normalize a raw record dict into the standard schema.
         Returns a dict ready for creating a RawRecord.
         """
+        normalized = self._map_fields(raw)
+
+        # Parse and standardize typed fields
+        normalized = self._parse_coordinates(normalized, raw)
+        normalized = self._parse_dates(normalized)
+        normalized = self._clean_phone(normalized)
+        normalized = self._standardize_state(normalized)
+        normalized = self._clean_zip(normalized)
+        normalized = self._clean_website(normalized)
+
+        return normalized
+
+    def normalize_batch(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Normalize a batch of raw records column by column. Date formats not
+        learned yet are learned from the batch first (learn_date_formats);
+        after that the result is identical to ``[self.normalize(r) for r in
+        records]``, but typed fields are cleaned per column: coordinates are converted and range
+        checked as float64 arrays (when NumPy is installed), each distinct
+        date string is parsed once, and zip/phone digits are extracted with
+        one regex pass over the whole column.
+        """
+        rows = [self._map_fields(raw) for raw in records]
+        if not rows:
+            return rows
+        self._learn_date_columns(rows)
+        self._parse_coordinates_batch(rows, records)
+        for field in DATE_FIELDS:
+            self._parse_date_column(rows, field)
+        self._clean_digit_column(rows, "phone", _format_phone)
+        self._clean_digit_column(rows, "zip_code", _format_zip)
+        for row in rows:
+            self._standardize_state(row)
+            self._clean_website(row)
+        return rows
+
+    def _map_fields(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        """Read and clean the standard fields of a record, with source defaults."""
+        plan = self._plan_for(raw)
+        clean = self._clean_value
         normalized = {}
 
         # Apply field mapping (map standard names to source values)
-        for std_field, src_field in self.field_mapping.items():
-            if not src_field:
-                continue
-            value = self._nested_get(raw, src_field)
+        for std_field, src_field, nested in plan.mapped:
+            value = self._nested_get(raw, src_field) if nested else raw[src_field]
             if value is not None:
-                normalized[std_field] = self._clean_value(value)
+                normalized[std_field] = clean(value)
 
-        # For unmapped fields, try direct name matching
-        for std_field in STANDARD_FIELDS:
+        # For unmapped (or empty) fields, use the auto-detected column
+        for std_field, src_field in plan.detected:
             if std_field not in normalized:
-                # Try exact match, then case-insensitive variations
-                for variation in self._field_name_variations(std_field):
-                    if variation in raw:
-                        normalized[std_field] = self._clean_value(raw[variation])
-                        break
+                normalized[std_field] = clean(raw[src_field])
 
         # Fill in source defaults
-        if "state" not in normalized or not normalized["state"]:
+        if not normalized.get("state"):
             normalized["state"] = self.source_state
-        if "category" not in normalized or not normalized["category"]:
+        if not normalized.get("category"):
             normalized["category"] = self.source_category
-
-        # Parse and standardize typed fields
-        normalized = self._parse_coordinates(normalized, raw)
-        normalized = self._parse_dates(normalized)
-        normalized = self._clean_phone(normalized)
-        normalized = self._standardize_state(normalized)
-        normalized = self._clean_zip(normalized)
-        normalized = self._clean_website(normalized)
-
         return normalized
 
+    def _plan_for(self, raw: Dict[str, Any]) -> "_Plan":
+        """
+        The compiled plan for this record's key set. Records from one source
+        almost always share their keys, so after the first record this is a
+        single key-set comparison; a new key set is planned once and cached.
+        """
+        if self._last_plan is not None and raw.keys() == self._last_keys:
+            return self._last_plan
+        keys = frozenset(raw)
+        plan = self._plans.get(keys)
+        if plan is None:
+            if len(self._plans) >= self.MAX_PLANS:
+                self._plans.clear()
+            plan = self._plans[keys] = self._compile_plan(keys)
+        self._last_keys, self._last_plan = keys, plan
+        return plan
+
+    def _compile_plan(self, keys: FrozenSet[str]) -> "_Plan":
+        """
+        Resolve every standard field to the raw key it is read from: mapped
+        fields to their source column (or dotted path), all fields to the
+        first of their _field_name_variations present in ``keys``.
+        """
+        mapped = []
+        for std_field, src_field in self.field_mapping.items():
+            if not src_field:
+                continue
+            nested = "." in src_field
+            if src_field.split(".")[0] in keys:
+                mapped.append((std_field, src_field, nested))
+        detected = []
+        for std_field in STANDARD_FIELDS:
+            for variation in self._field_name_variations(std_field):
+                if variation in keys:
+                    detected.append((std_field, variation))
+                    break
+        return _Plan(tuple(mapped), tuple(detected))
+
     def _nested_get(self, data: dict, key_path: str, default=None):
         """
         Get a value from a dict using dot notation for nested access.
@@ -114,38 +339,53 @@ def _field_name_variations(self, std_field: str) -> list:
             std_field.upper(),
             std_field.replace("_", " ").title(),  # Title Case
         ]
-        # Special mappings
-        aliases = {
-            "name": ["dba", "business_name", "tradename", "license_name",
-                     "dispensary_name", "facility_name", "applicant_name"],
-            "license_number": ["license_no", "ubi", "license_id", "permit_number",
-                               "lic_no", "license"],
-            "license_type": ["type", "privilege", "category", "permit_type"],
-            "license_status": ["status", "license_status"],
-            "address": ["street", "street_address", "premise_address",
-                        "physicaladdress", "physical_address"],
-            "city": ["premise_city", "city_town", "physicalcity"],
-            "zip_code": ["zip", "postal_code", "zipcode", "premise_zip",
-                         "physicalzip"],
-            "county": ["borough", "parish"],
-            "latitude": ["lat", "y", "ylat"],
-            "longitude": ["lon", "lng", "long", "x", "xlong"],
-            "phone": ["telephone", "phone_number", "contact_phone"],
-            "website": ["url", "web", "web_address"],
-            "license_date": ["issued", "issue_date", "issueddate",
-                             "effective_date", "licenseissuedate"],
-            "expiry_date": ["expires", "expiration_date", "expiration",
-                            "expirationdate", "licenseexpirationdate"],
-        }
-        if std_field in aliases:
-            variations.extend(aliases[std_field])
+        variations.extend(FIELD_ALIASES.get(std_field, ()))
         return variations
 
+    def candidate_columns(self) -> FrozenSet[str]:
+        """
+        Raw column names the normalizer may read without a field_mapping
+        entry: the detected spellings of every unmapped standard field, all
+        latitude/longitude spellings and the LOCATION_KEYS objects.
+        """
+        mapped = {field for field, column in self.field_mapping.items() if column}
+        columns = set(LOCATION_KEYS)
+        for field in (STANDARD_FIELDS - mapped) | {"latitude", "longitude"}:
+            columns.update(self._field_name_variations(field))
+        return frozenset(columns)
+
+    def suggest_field_mapping(self, columns: Iterable[str]) -> Dict[str, str]:
+        """
+        Suggest field_mapping entries ({standard_name: column}) for a sample's
+        columns, matching standard names and FIELD_ALIASES while ignoring
+        case and punctuation. Exact standard names win over aliases; fields
+        and columns that are already mapped are left out.
+        """
+        taken = {str(v).split(".")[0] for v in self.field_mapping.values() if v}
+        by_key: Dict[str, str] = {}
+        for column in columns:
+            if column not in taken:
+                by_key.setdefault(_match_key(column), column)
+        unmapped = sorted(f for f in STANDARD_FIELDS if not self.field_mapping.get(f))
+
+        suggested = {}
+        for exact in (True, False):
+            for std_field in unmapped:
+                if std_field in suggested:
+                    continue
+                names = (std_field,) if exact else FIELD_ALIASES.get(std_field, ())
+                for name in names:
+                    column = by_key.get(_match_key(name))
+                    if column and column not in suggested.values():
+                        suggested[std_field] = column
+                        break
+        return suggested
+
     def _clean_value(self, value) -> Any:
         """Basic value cleaning."""
         if isinstance(value, str):
             value = value.strip()
-            if value.lower() in ("", "n/a", "na", "null", "none", "-", "unknown"):
+            if value.lower() in _NULL_STRINGS:
                 return None
         return value if value != "" else None
 
@@ -153,26 +393,7 @@ def _parse_coordinates(
         self, normalized: Dict, raw: Dict
     ) -> Dict:
         """Extract and validate latitude/longitude."""
-        # Try various coordinate field formats
-        lat = normalized.get("latitude")
-        lon = normalized.get("longitude")
-
-        # Handle Socrata nested location object: {"latitude": "...", "longitude": "..."}
-        for loc_key in ("location", "geolocation", "coordinates", "point"):
-            if loc_key in raw and isinstance(raw[loc_key], dict):
-                loc = raw[loc_key]
-                if lat is None:
-                    lat = loc.get("latitude") or loc.get("lat")
-                if lon is None:
-                    lon = loc.get("longitude") or loc.get("lon") or loc.get("lng")
-                break
-
-        # Handle Socrata location with "human_address"
-        if lat is None and "location" in raw:
-            loc = raw.get("location")
-            if isinstance(loc, dict):
-                lat = loc.get("latitude")
-                lon = loc.get("longitude")
+        lat, lon = self._coordinate_values(normalized, raw)
 
         # Convert to float and validate
         try:
@@ -196,46 +417,172 @@ def _parse_coordinates(
 
         return normalized
 
+    def _coordinate_values(self, normalized: Dict, raw: Dict) -> Tuple[Any, Any]:
+        """The raw (unconverted) latitude and longitude of a record."""
+        # Try various coordinate field formats
+        lat = normalized.get("latitude")
+        lon = normalized.get("longitude")
+
+        # Handle Socrata nested location object: {"latitude": "...", "longitude": "..."}
+        for loc_key in LOCATION_KEYS:
+            if loc_key in raw and isinstance(raw[loc_key], dict):
+                loc = raw[loc_key]
+                if lat is None:
+                    lat = loc.get("latitude") or loc.get("lat")
+                if lon is None:
+                    lon = loc.get("longitude") or loc.get("lon") or loc.get("lng")
+                break
+
+        # Handle Socrata location with "human_address"
+        if lat is None and "location" in raw:
+            loc = raw.get("location")
+            if isinstance(loc, dict):
+                lat = loc.get("latitude")
+                lon = loc.get("longitude")
+        return lat, lon
+
+    def _parse_coordinates_batch(self, rows: List[Dict], records: List[Dict]) -> None:
+        """_parse_coordinates for a batch, converting and range checking as arrays."""
+        if np is None:
+            for row, raw in zip(rows, records):
+                self._parse_coordinates(row, raw)
+            return
+        pairs = [self._coordinate_values(row, raw) for row, raw in zip(rows, records)]
+        lat, lat_bad = _float_column([p[0] for p in pairs])
+        lon, lon_bad = _float_column([p[1] for p in pairs])
+
+        lat_ok = (lat >= -90) & (lat <= 90)  # False for missing (NaN) values
+        lon_ok = (lon >= -180) & (lon <= 180)
+        null_island = lat_ok & lon_ok & (lat == 0.0) & (lon == 0.0)
+        # A value that fails to convert blanks both coordinates
+        lat_ok &= ~(null_island | lat_bad | lon_bad)
+        lon_ok &= ~(null_island | lat_bad | lon_bad)
+
+        for row, la, la_ok, lo, lo_ok in zip(
+            rows, lat.tolist(), lat_ok.tolist(), lon.tolist(), lon_ok.tolist()
+        ):
+            row["latitude"] = la if la_ok else None
+            row["longitude"] = lo if lo_ok else None
+
     def _parse_dates(self, normalized: Dict) -> Dict:
         """Parse date strings into date objects."""
-        date_fields = ["record_date", "license_date", "expiry_date"]
-        for field in date_fields:
+        for field in DATE_FIELDS:
             val = normalized.get(field)
             if val and not isinstance(val, (date, datetime)):
-                parsed = self._parse_date_string(str(val))
+                parsed = self._parse_date_string(str(val), field)
                 normalized[field] = parsed
 
         return normalized
 
-    def _parse_date_string(self, date_str: str) -> Optional[date]:
-        """Try various date formats."""
-        if not date_str or date_str.lower() in ("n/a", "none", "null"):
-            return None
+    def _parse_date_column(self, rows: List[Dict], field: str) -> None:
+        """_parse_dates for one field of a batch (repeated values hit the LRU)."""
+        for row in rows:
+            val = row.get(field)
+            if val and not isinstance(val, (date, datetime)):
+                row[field] = self._parse_date_string(str(val), field)
 
-        # Truncate to date part if datetime string
-        date_str = date_str.split("T")[0].split(" ")[0].strip()
+    def learn_date_formats(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Learn the format order of every date field that has not learned one
+        yet from a sample of raw records. normalize_batch does this with its
+        own records; call it before normalize() to learn from more than the
+        first value of each field. The first non-empty sample settles every
+        field, so later calls return at once.
+        """
+        if all(self._date_column(field).learned for field in DATE_FIELDS):
+            return
+        self._learn_date_columns([self._map_fields(raw) for raw in records])
+
+    def _learn_date_columns(self, rows: List[Dict]) -> None:
+        if not rows:
+            return
+        for field in DATE_FIELDS:
+            column = self._date_column(field)
+            if column.learned:
+                continue
+            values = [row.get(field) for row in rows]
+            values = [str(v) for v in values if v and not isinstance(v, (date, datetime))]
+            values = [v for v in values if v.lower() not in _NULL_DATES]
+            column.learn(values)
+            # A field with no parseable values in the sample keeps the
+            # DATE_FORMATS order rather than learning from a later batch
+            column.learned = True
+
+    def _parse_date_string(self, date_str: str, field: Optional[str] = None) -> Optional[date]:
+        """
+        Parse a date with the formats learned for ``field`` (see _DateColumn).
+        Results are memoized per field.
+        """
+        if not date_str or date_str.lower() in _NULL_DATES:
+            return None
+        return self._date_column(field).parse(date_str)
+
+    def _date_column(self, field: Optional[str]) -> "_DateColumn":
+        """The date parsing state of a field, created on first use."""
+        column = self._date_columns.get(field)
+        if column is None:
+            preferred = (getattr(self.source, "options", None) or {}).get("date_formats")
+            if isinstance(preferred, dict):
+                preferred = preferred.get(field)
+            learned = None if self._learn_dates else DATE_FORMATS
+            column = self._date_columns[field] = _DateColumn(preferred, learned)
+        return column
+
+    def learned_date_formats(self) -> Dict[str, List[str]]:
+        """The format order of every date field that has learned one."""
+        return {
+            field: list(column.formats)
+            for field, column in self._date_columns.items()
+            if field is not None and column.learned
+        }
 
-        formats = [
-            "%Y-%m-%d", "%m/%d/%Y", "%m-%d-%Y",
-            "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d",
-            "%m/%d/%y", "%d-%b-%Y", "%B %d, %Y",
-        ]
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str, fmt).date()
-            except ValueError:
+    def use_date_formats(self, formats: Dict[str, List[str]]) -> None:
+        """
+        Parse with format orders learned by another normalizer of the same
+        source, and stop learning: fields missing from ``formats`` keep the
+        DATE_FORMATS order.
+        """
+        self._learn_dates = False
+        for field, order in formats.items():
+            column = self._date_columns.get(field)
+            if column is None or column.formats != order:
+                self._date_columns[field] = _DateColumn(learned=order)
+
+    def seen_date_fields(self) -> List[str]:
+        """The date fields that have had a value to parse."""
+        return [field for field, column in self._date_columns.items()
+                if field is not None and column.seen]
+
+    def mark_date_fields_seen(self, fields: Iterable[str]) -> None:
+        """Count ``fields`` as parsed by another normalizer of the same source."""
+        for field in fields:
+            self._date_column(field).seen = True
+
+    def date_format_report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        The format each date field was parsed with, and whether its values
+        could not tell day from month. Logged ambiguous fields are parsed
+        month-first until options.date_formats picks a format for them.
+        """
+        report = {}
+        for field, column in self._date_columns.items():
+            if field is None or not column.seen:
                 continue
-        return None
+            report[field] = {"format": column.formats[0], "ambiguous": column.ambiguous}
+            if column.ambiguous and not column.warned:
+                column.warned = True
+                logger.warning(
+                    f"{getattr(self.source, 'source_id', self.source)}: {field} values are "
+                    f"ambiguous between day/month and month/day; parsed as "
+                    f"{column.formats[0]}. Set options.date_formats.{field} to choose."
+                )
+        return report
 
     def _clean_phone(self, normalized: Dict) -> Dict:
         """Standardize phone number format."""
         phone = normalized.get("phone")
         if phone:
-            digits = re.sub(r"\D", "", str(phone))
-            if len(digits) == 10:
-                normalized["phone"] = f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
-            elif len(digits) == 11 and digits[0] == "1":
-                normalized["phone"] = f"({digits[1:4]}) {digits[4:7]}-{digits[7:]}"
+            normalized["phone"] = _format_phone(phone, _NON_DIGITS.sub("", str(phone)))
         return normalized
 
     def _standardize_state(self, normalized: Dict) -> Dict:
@@ -243,26 +590,7 @@ def _standardize_state(self, normalized: Dict) -> Dict:
         state = normalized.get("state")
         if state and len(state) > 2:
             # Could be full state name - map to abbreviation
-            state_map = {
-                "alaska": "AK", "arizona": "AZ", "arkansas": "AR",
-                "california": "CA", "colorado": "CO", "connecticut": "CT",
-                "delaware": "DE", "florida": "FL", "georgia": "GA",
-                "hawaii": "HI", "idaho": "ID", "illinois": "IL",
-                "indiana": "IN", "iowa": "IA", "kansas": "KS",
-                "kentucky": "KY", "louisiana": "LA", "maine": "ME",
-                "maryland": "MD", "massachusetts": "MA", "michigan": "MI",
-                "minnesota": "MN", "mississippi": "MS", "missouri": "MO",
-                "montana": "MT", "nebraska": "NE", "nevada": "NV",
-                "new hampshire": "NH", "new jersey": "NJ", "new mexico": "NM",
-                "new york": "NY", "north carolina": "NC", "north dakota": "ND",
-                "ohio": "OH", "oklahoma": "OK", "oregon": "OR",
-                "pennsylvania": "PA", "rhode island": "RI", "south carolina": "SC",
-                "south dakota": "SD", "tennessee": "TN", "texas": "TX",
-                "utah": "UT", "vermont": "VT", "virginia": "VA",
-                "washington": "WA", "west virginia": "WV", "wisconsin": "WI",
-                "wyoming": "WY", "district of columbia": "DC",
-            }
-            abbr = state_map.get(state.lower().strip())
+            abbr = STATE_ABBREVIATIONS.get(state.lower().strip())
             if abbr:
                 normalized["state"] = abbr
         elif state:
@@ -273,15 +601,18 @@ def _clean_zip(self, normalized: Dict) -> Dict:
         """Standardize ZIP code to 5-digit format."""
         zip_code = normalized.get("zip_code")
         if zip_code:
-            zip_str = str(zip_code).strip()
-            # Extract first 5 digits
-            digits = re.sub(r"\D", "", zip_str)
-            if len(digits) >= 5:
-                normalized["zip_code"] = digits[:5]
-            elif digits:
-                normalized["zip_code"] = digits.zfill(5)
+            normalized["zip_code"] = _format_zip(zip_code, _NON_DIGITS.sub("", str(zip_code)))
         return normalized
 
+    def _clean_digit_column(self, rows: List[Dict], field: str, formatter) -> None:
+        """Apply a phone/zip formatter to one field of a batch, extracting digits per column."""
+        present = [row for row in rows if row.get(field)]
+        if not present:
+            return
+        values = [row[field] for row in present]
+        for row, value, digits in zip(present, values, _digit_strings([str(v) for v in values])):
+            row[field] = formatter(value, digits)
+
     def _clean_website(self, normalized: Dict) -> Dict:
         """Ensure website has http(s) prefix."""
         website = normalized.get("website")
@@ -290,3 +621,79 @@ def _clean_website(self, normalized: Dict) -> Dict:
             if website and not website.startswith(("http://", "https://")):
                 normalized["website"] = "https://" + website
         return normalized
+
+
+def _match_key(name: str) -> str:
+    """Column name reduced to lowercase letters and digits for fuzzy matching."""
+    return re.sub(r"[^a-z0-9]", "", str(name).lower())
+
+
+def _date_text(date_str: str) -> str:
+    """The date part of a date or datetime string."""
+    return date_str.split("T")[0].split(" ")[0].strip()
+
+
+def _parse_date_format(text: str, fmt: str) -> Optional[date]:
+    """Parse ``text`` with one strptime format; None if it does not match."""
+    if fmt == "%Y-%m-%d":
+        # Fast path without strptime; strptime also takes unpadded 2021-3-4
+        iso = _ISO_DATE.fullmatch(text)
+        if iso:
+            try:
+                return date(int(iso[1]), int(iso[2]), int(iso[3]))
+            except ValueError:
+                return None
+    try:
+        return datetime.strptime(text, fmt).date()
+    except ValueError:
+        return None
+
+
+def _format_phone(phone: Any, digits: str) -> Any:
+    """(555) 555-5555 for 10-digit (or 1 + 10-digit) numbers, else unchanged."""
+    if len(digits) == 10:
+        return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+    if len(digits) == 11 and digits[0] == "1":
+        return f"({digits[1:4]}) {digits[4:7]}-{digits[7:]}"
+    return phone
+
+
+def _format_zip(zip_code: Any, digits: str) -> Any:
+    """First 5 digits of a ZIP (zero-padded if shorter), else unchanged."""
+    if len(digits) >= 5:
+        return digits[:5]
+    if digits:
+        return digits.zfill(5)
+    return zip_code
+
+
+def _digit_strings(values: List[str]) -> List[str]:
+    """
+    The digits of every value, like _NON_DIGITS.sub("", v), extracted with a
+    single regex pass over the values joined by NUL.
+    """
+    joined = "\x00".join(values)
+    if joined.count("\x00") != len(values) - 1:
+        return [_NON_DIGITS.sub("", v) for v in values]  # A value contains NUL
+    return _NON_DIGITS_OR_SEP.sub("", joined).split("\x00")
+
+
+def _float_column(values: List[Any]):
+    """
+    Convert values to a float64 array the way float() would, with None and
+    "" as NaN. Returns (array, mask of values float() rejected).
+    """
+    cleaned = [np.nan if v is None or v == "" else v for v in values]
+    try:
+        return np.fromiter(cleaned, dtype=np.float64, count=len(cleaned)), np.zeros(len(cleaned), bool)
+    except (ValueError, TypeError):
+        pass
+    floats, bad = [], []
+    for v in cleaned:
+        try:
+            floats.append(float(v))
+            bad.append(False)
+        except (ValueError, TypeError):
+            floats.append(np.nan)
+            bad.append(True)
+    return np.array(floats, dtype=np.float64), np.array(bad, dtype=bool)
@@ -5,9 +5,12 @@
 import hashlib
 import json
 import logging
+import multiprocessing as mp
 import os
-from datetime import datetime
-from typing import Optional, List
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional, List, Tuple
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
@@ -17,13 +20,21 @@
 
 from src.storage.database import session_scope, get_database_url
 from src.storage.models import (
-    DataSource, CollectionSchedule, CollectionRun, CollectionLog, RawRecord
+    DataSource, CollectionSchedule, CollectionRun, CollectionLog, RawRecord,
+    HttpValidator,
 )
 from src.collectors import get_collector
+from src.collectors.base import SourceUnchanged
+from src.collectors.raw_archive import RawArchiveReader, RawArchiveWriter
+from src.collectors.session_pool import get_session_registry
 from src.processors.normalizer import RecordNormalizer
+from src.scheduler.pipeline import Pipeline
+from src.settings import get_setting
 
 logger = logging.getLogger(__name__)
 
+BATCH_SIZE = 500  # Records normalized and committed together
+
 
 class SchedulerManager:
     """
@@ -81,6 +92,7 @@ def stop(self):
         if self.scheduler and self.scheduler.running:
             self.scheduler.shutdown(wait=True)
             logger.info("Scheduler stopped.")
+        get_session_registry().close_all()
 
     def sync_schedules(self):
         """
@@ -222,10 +234,18 @@ def run_collection_job(
     source_db_id: int,
     schedule_db_id: Optional[int] = None,
     triggered_by: str = "scheduler",
+    full_refresh: bool = False,
+    replay_run_id: Optional[int] = None,
+    resume: bool = False,
 ) -> dict:
     """
     The main collection function executed by APScheduler.
     Fetches data from a source, normalizes it, and stores it in the database.
+    Set full_refresh to ignore incremental watermarks for this run.
+    Set replay_run_id to re-process the raw archive of an earlier run
+    instead of fetching from the network.
+    Set resume (or the source option auto_resume) to continue an
+    interrupted run from its last committed batch.
     Returns a summary dict.
     """
     run_logger = logging.getLogger("collector.job")
@@ -239,6 +259,16 @@ def run_collection_job(
             run_logger.info(f"Source {source.source_id} is disabled, skipping")
             return {"status": "skipped"}
 
+        replay_path = None
+        if replay_run_id is not None:
+            replayed = session.get(CollectionRun, replay_run_id)
+            if not replayed or replayed.source_id != source_db_id:
+                raise ValueError(f"Run {replay_run_id} does not belong to source {source_db_id}")
+            if not replayed.raw_file_path:
+                raise ValueError(f"Run {replay_run_id} has no raw archive to replay")
+            replay_path = replayed.raw_file_path
+            triggered_by = "replay"
+
         # Create run record
         run = CollectionRun(
             source_id=source_db_id,
@@ -251,88 +281,114 @@ def run_collection_job(
         session.flush()
         run_id = run.id
         source_snapshot = source.to_dict()  # Avoid DetachedInstanceError
+        # A replay must not pick up (or later provide) incremental state
+        previous_state = (
+            {} if replay_path else _load_previous_state(session, source_db_id, run_id)
+        )
+        validators = {
+            v.url: v.to_dict()
+            for v in session.query(HttpValidator).filter_by(source_id=source_db_id)
+        }
+        resume_from, resumed_run_id = {}, None
+        if not replay_path and not full_refresh and (
+            resume or (source.options or {}).get("auto_resume")
+        ):
+            resume_from, resumed_run_id = _load_resume_checkpoint(
+                session, source_db_id, run_id
+            )
 
     run_logger.info(
         f"[Run {run_id}] Starting collection: {source_snapshot['source_id']} "
         f"({source_snapshot['state']}/{source_snapshot['category']})"
     )
 
-    records_fetched = 0
+    progress = {"fetched": 0}
     records_stored = 0
     records_skipped = 0
     error_message = None
     status = "running"
+    collector = None
+    archive = None
+    raw_file_path = replay_path
+    last_checkpoint = resume_from
 
     try:
         # Create source proxy object for collector
         source_proxy = _SourceProxy(source_snapshot)
         collector = get_collector(source_proxy)
+        collector.previous_state = previous_state
+        collector.full_refresh = full_refresh
+        if replay_path:
+            collector.replay = RawArchiveReader(replay_path)
+            collector.run_details["replay_of"] = replay_run_id
+            run_logger.info(
+                f"[Run {run_id}] Replaying {collector.replay.response_count} archived "
+                f"responses from run {replay_run_id}"
+            )
+        else:
+            collector.validators = validators
+            archive = _open_archive(source_snapshot, run_id, run_logger)
+            collector.archive = archive
+        if resume_from:
+            collector.resume_from = resume_from
+            collector.run_details["resumed_from"] = resumed_run_id
+            run_logger.info(
+                f"[Run {run_id}] Resuming run {resumed_run_id} at {resume_from}"
+            )
         normalizer = RecordNormalizer(source_proxy)
 
-        batch = []
-        batch_size = 500
-
-        for raw_record in collector.collect():
-            records_fetched += 1
-
-            # Normalize the record
-            normalized = normalizer.normalize(raw_record)
-
-            # Compute hash for deduplication
-            record_hash = RawRecord.compute_hash(raw_record)
-
-            # Build RawRecord
-            record = RawRecord(
-                source_id=source_db_id,
-                run_id=run_id,
-                state=normalized.get("state"),
-                category=normalized.get("category") or source_snapshot.get("category"),
-                subcategory=normalized.get("subcategory") or source_snapshot.get("subcategory"),
-                name=normalized.get("name"),
-                license_number=normalized.get("license_number"),
-                license_type=normalized.get("license_type"),
-                license_status=normalized.get("license_status"),
-                address=normalized.get("address"),
-                city=normalized.get("city"),
-                zip_code=normalized.get("zip_code"),
-                county=normalized.get("county"),
-                latitude=normalized.get("latitude"),
-                longitude=normalized.get("longitude"),
-                phone=normalized.get("phone"),
-                email=normalized.get("email"),
-                website=normalized.get("website"),
-                record_date=normalized.get("record_date"),
-                license_date=normalized.get("license_date"),
-                expiry_date=normalized.get("expiry_date"),
-                record_data=raw_record,
-                record_hash=record_hash,
-            )
-            batch.append(record)
+        workers = _normalize_workers(source_snapshot)
+        if workers > 1:
+            collector.run_details["normalize_workers"] = workers
+            run_logger.info(f"[Run {run_id}] Normalizing in {workers} processes")
 
-            # Flush in batches
-            if len(batch) >= batch_size:
-                stored = _flush_batch(batch, run_id, source_db_id, run_logger)
+        # Fetch, normalize and write on separate threads so page downloads
+        # overlap database commits
+        pipeline = Pipeline(get_setting("collection.pipeline_depth", 4))
+        try:
+            pipeline.source("fetch", _collect_batches(collector, BATCH_SIZE, progress))
+            pipeline.stage("transform", lambda batches: _transform_batches(
+                batches, normalizer, workers, run_id, source_snapshot
+            ))
+            for batch, checkpoint, records in pipeline.results("write"):
+                last_checkpoint = checkpoint or last_checkpoint
+                stored = _flush_batch(records, run_id, source_db_id, run_logger, last_checkpoint)
                 records_stored += stored
                 records_skipped += len(batch) - stored
-                batch = []
-
-        # Flush remaining
-        if batch:
-            stored = _flush_batch(batch, run_id, source_db_id, run_logger)
-            records_stored += stored
-            records_skipped += len(batch) - stored
+        finally:
+            pipeline.close()
+            collector.run_details["pipeline"] = pipeline.report()
 
+        date_formats = normalizer.date_format_report()
+        if date_formats:
+            collector.run_details["date_formats"] = date_formats
         status = "success"
         run_logger.info(
-            f"[Run {run_id}] Completed: fetched={records_fetched} "
+            f"[Run {run_id}] Completed: fetched={progress['fetched']} "
             f"stored={records_stored} skipped={records_skipped}"
         )
 
+    except SourceUnchanged as e:
+        status = "unchanged"
+        run_logger.info(f"[Run {run_id}] Source unchanged, skipping: {e}")
+
     except Exception as e:
         status = "failed"
         error_message = str(e)
         run_logger.error(f"[Run {run_id}] Collection failed: {e}", exc_info=True)
 
+    finally:
+        if collector is not None and collector.replay is not None:
+            collector.replay.close()
+        if archive is not None:
+            archive.close()
+            if archive.responses:
+                raw_file_path = archive.relative_path
+            else:
+                _remove_file(archive.path)
+
+    records_fetched = progress["fetched"]
+
     # Update run record
     with session_scope() as session:
         run = session.get(CollectionRun, run_id)
@@ -343,10 +399,19 @@ def run_collection_job(
             run.records_stored = records_stored
             run.records_skipped = records_skipped
             run.error_message = error_message
+            run.raw_file_path = raw_file_path
+            details = dict(collector.run_details) if collector is not None else {}
+            if status == "failed" and last_checkpoint:
+                # Keep the resume point of the last committed batch
+                details["checkpoint"] = last_checkpoint
+            run.details = details or None
             run.duration_seconds = (
                 datetime.utcnow() - run.started_at
             ).total_seconds()
 
+        if status == "success" and collector is not None and collector.new_validators:
+            _save_validators(session, source_db_id, collector.new_validators)
+
         # Update schedule last_run
         if schedule_db_id:
             sched = session.get(CollectionSchedule, schedule_db_id)
@@ -357,7 +422,7 @@ def run_collection_job(
         log = CollectionLog(
             run_id=run_id,
             source_id=source_db_id,
-            level="INFO" if status == "success" else "ERROR",
+            level="ERROR" if status == "failed" else "INFO",
             message=f"Collection {status}: {records_stored}/{records_fetched} records stored",
             details={
                 "status": status,
@@ -377,18 +442,348 @@ def run_collection_job(
     }
 
 
+def check_dataset_updates(source_db_id: int) -> dict:
+    """
+    Pre-flight a SODA source without collecting: compare the dataset's
+    view metadata and the source config fingerprint with those saved by
+    its last successful run.
+    Returns a dict with status "changed", "unchanged" or "unknown".
+    """
+    with session_scope() as session:
+        source = session.get(DataSource, source_db_id)
+        if not source:
+            raise ValueError(f"DataSource {source_db_id} not found")
+        source_snapshot = source.to_dict()
+        previous_state = _load_previous_state(session, source_db_id, None)
+        previous = previous_state.get("dataset_version")
+
+    result = {
+        "source_id": source_snapshot["source_id"],
+        "previous": previous,
+        "current": None,
+        "status": "unknown",
+        "error": None,
+    }
+    collector = get_collector(_SourceProxy(source_snapshot))
+    try:
+        if not hasattr(collector, "get_dataset_version"):
+            result["error"] = "not a SODA source"
+            return result
+        current = collector.get_dataset_version()
+        config_changed = (
+            collector.get_config_fingerprint() != previous_state.get("config_fingerprint")
+        )
+    except Exception as e:
+        result["error"] = str(e)
+        return result
+    finally:
+        collector.close()
+
+    result["current"] = current
+    if current is not None and previous is not None:
+        unchanged = current == previous and not config_changed
+        result["status"] = "unchanged" if unchanged else "changed"
+    elif current is not None:
+        result["status"] = "changed"  # Never collected with metadata before
+    return result
+
+
+def preview_source(source_db_id: int, n: Optional[int] = None) -> dict:
+    """
+    Fetch the first ``n`` records of a source without storing anything, with
+    suggested field_mapping entries (see BaseCollector.preview). Disabled
+    sources can be previewed, so a source can be checked before enabling it.
+    """
+    with session_scope() as session:
+        source = session.get(DataSource, source_db_id)
+        if not source:
+            raise ValueError(f"DataSource {source_db_id} not found")
+        source_snapshot = source.to_dict()
+
+    collector = get_collector(_SourceProxy(source_snapshot))
+    try:
+        return collector.preview(n)
+    finally:
+        collector.close()
+
+
+def _open_archive(source: dict, run_id: int, log: logging.Logger):
+    """Start the raw-response archive for a run, unless disabled."""
+    if not get_setting("storage.archive_raw", True):
+        return None
+    if (source.get("options") or {}).get("archive_raw") is False:
+        return None
+    try:
+        return RawArchiveWriter.for_run(
+            source["source_id"], run_id,
+            meta={"format": source.get("format"), "url": source.get("url")},
+        )
+    except OSError as e:
+        log.warning(f"[Run {run_id}] Raw archive disabled for this run: {e}")
+        return None
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _load_previous_state(session, source_db_id: int, current_run_id: int) -> dict:
+    """Return the details saved by the source's last successful (non-replay) run."""
+    last_run = (
+        session.query(CollectionRun)
+        .filter(
+            CollectionRun.source_id == source_db_id,
+            CollectionRun.status == "success",
+            CollectionRun.id != current_run_id,
+            CollectionRun.triggered_by != "replay",
+        )
+        .order_by(CollectionRun.started_at.desc())
+        .first()
+    )
+    if last_run and last_run.details:
+        return dict(last_run.details)
+    return {}
+
+
+def _load_resume_checkpoint(session, source_db_id: int, current_run_id: int):
+    """
+    Return (checkpoint, run id) of the source's latest run if it failed
+    with a checkpoint, else ({}, None). A run that completed since then
+    means there is nothing to resume. A run still marked running is only
+    resumed once _mark_stale_run finds it abandoned; a live run is left
+    alone so two jobs never store the same rows.
+    """
+    last_run = (
+        session.query(CollectionRun)
+        .filter(
+            CollectionRun.source_id == source_db_id,
+            CollectionRun.id != current_run_id,
+            CollectionRun.triggered_by != "replay",
+        )
+        .order_by(CollectionRun.started_at.desc())
+        .first()
+    )
+    if last_run is not None and last_run.status == "running":
+        _mark_stale_run(last_run)
+    if last_run is None or last_run.status != "failed":
+        return {}, None
+    checkpoint = (last_run.details or {}).get("checkpoint")
+    if not checkpoint:
+        return {}, None
+    return dict(checkpoint), last_run.id
+
+
+def _mark_stale_run(run: CollectionRun) -> None:
+    """
+    Mark a "running" run failed when it has shown no progress for
+    collection.stale_run_minutes, i.e. its process died before recording
+    the outcome. Progress is the heartbeat _flush_batch saves with every
+    batch, or the start time before the first batch.
+    """
+    minutes = get_setting("collection.stale_run_minutes", 60)
+    heartbeat = (run.details or {}).get("heartbeat")
+    last_seen = datetime.fromisoformat(heartbeat) if heartbeat else run.started_at
+    if datetime.utcnow() - last_seen < timedelta(minutes=minutes):
+        return
+    run.status = "failed"
+    run.completed_at = datetime.utcnow()
+    run.error_message = f"Abandoned: no progress since {last_seen.isoformat()}"
+    logger.warning(f"Run {run.id} marked failed: no progress since {last_seen.isoformat()}")
+
+
+def _save_validators(session, source_db_id: int, validators: dict) -> None:
+    """Upsert the ETag / Last-Modified validators captured during a run."""
+    for url, values in validators.items():
+        url_hash = HttpValidator.hash_url(url)
+        row = (
+            session.query(HttpValidator)
+            .filter_by(source_id=source_db_id, url_hash=url_hash)
+            .first()
+        )
+        if row is None:
+            row = HttpValidator(source_id=source_db_id, url=url, url_hash=url_hash)
+            session.add(row)
+        row.etag = values.get("etag")
+        row.last_modified = values.get("last_modified")
+
+
+def _normalize_workers(source: dict) -> int:
+    """
+    Processes to normalize and hash records in: options.parallel_normalize
+    (true = one per CPU, or a number), else collection.normalize_workers.
+    0 or 1 normalizes in the job's own thread.
+    """
+    setting = (source.get("options") or {}).get("parallel_normalize")
+    if setting is None:
+        setting = get_setting("collection.normalize_workers", 0)
+    if setting is True:
+        return os.cpu_count() or 1
+    return int(setting or 0)
+
+
+def _collect_batches(collector, batch_size: int, progress: dict):
+    """
+    Group the collector's records into batches of ``batch_size``. Yields
+    (raw records, collector checkpoint after the batch's last record) and
+    counts fetched records in ``progress["fetched"]``.
+    """
+    batch = []
+    for raw_record in collector.collect():
+        progress["fetched"] += 1
+        batch.append(raw_record)
+        if len(batch) >= batch_size:
+            yield batch, collector.get_checkpoint()
+            batch = []
+    if batch:
+        yield batch, collector.get_checkpoint()
+
+
+def _transform_batches(
+    batches, normalizer: RecordNormalizer, workers: int, run_id: int, source: dict
+):
+    """
+    Normalize and hash each batch and build its RawRecord rows, yielding
+    (raw records, checkpoint, rows) in collection order.
+
+    With more than one worker, batches after the first are sent to a process
+    pool, at most two per worker at a time, and results are taken back in
+    submission order. The first batch is normalized here and settles the
+    date formats of every field (RecordNormalizer.learn_date_formats), as
+    in the serial path; workers parse with those formats and never learn,
+    and report which date fields they parsed, so the output and
+    date_format_report match the serial run.
+    """
+    batches = iter(batches)
+    for batch, checkpoint in batches:
+        yield batch, checkpoint, _build_records(batch, normalizer, run_id, source)
+        if workers > 1:
+            break
+    else:
+        return
+    date_formats = normalizer.learned_date_formats()
+
+    # spawn: forking a threaded scheduler process can copy held locks
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp.get_context("spawn"),
+        initializer=_init_normalize_worker,
+        initargs=(source,),
+    )
+    pending = deque()
+    try:
+        def take():
+            done, done_checkpoint, future = pending.popleft()
+            results, seen_dates = future.result()
+            normalizer.mark_date_fields_seen(seen_dates)
+            return done, done_checkpoint, _to_raw_records(done, results, run_id, source)
+
+        for batch, checkpoint in batches:
+            pending.append((batch, checkpoint, pool.submit(_normalize_in_worker, batch, date_formats)))
+            if len(pending) >= workers * 2:
+                yield take()
+        while pending:
+            yield take()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+_worker_normalizer: Optional[RecordNormalizer] = None
+
+
+def _init_normalize_worker(source: dict) -> None:
+    """Process pool initializer: one normalizer per worker for the whole run."""
+    global _worker_normalizer
+    _worker_normalizer = RecordNormalizer(_SourceProxy(source))
+    _worker_normalizer.use_date_formats({})
+
+
+def _normalize_in_worker(
+    raw_records: List[dict], date_formats: dict
+) -> Tuple[List[Tuple[dict, str]], List[str]]:
+    """(normalized, hash) results of a batch, and the date fields parsed so far."""
+    _worker_normalizer.use_date_formats(date_formats)
+    results = _normalize_and_hash(raw_records, _worker_normalizer)
+    return results, _worker_normalizer.seen_date_fields()
+
+
+def _normalize_and_hash(
+    raw_records: List[dict], normalizer: RecordNormalizer
+) -> List[Tuple[dict, str]]:
+    """(normalized fields, record hash) for each raw record."""
+    normalized = normalizer.normalize_batch(raw_records)
+    return [(n, RawRecord.compute_hash(raw)) for n, raw in zip(normalized, raw_records)]
+
+
+def _build_records(
+    raw_records: List[dict], normalizer: RecordNormalizer, run_id: int, source: dict
+) -> List[RawRecord]:
+    """Normalize a batch of raw records (column-wise) and build their RawRecord rows."""
+    return _to_raw_records(
+        raw_records, _normalize_and_hash(raw_records, normalizer), run_id, source
+    )
+
+
+def _to_raw_records(
+    raw_records: List[dict], results: List[Tuple[dict, str]], run_id: int, source: dict
+) -> List[RawRecord]:
+    """RawRecord rows from raw records and their (normalized, hash) results."""
+    records = []
+    for raw_record, (normalized, record_hash) in zip(raw_records, results):
+        records.append(RawRecord(
+            source_id=source["id"],
+            run_id=run_id,
+            state=normalized.get("state"),
+            category=normalized.get("category") or source.get("category"),
+            subcategory=normalized.get("subcategory") or source.get("subcategory"),
+            name=normalized.get("name"),
+            license_number=normalized.get("license_number"),
+            license_type=normalized.get("license_type"),
+            license_status=normalized.get("license_status"),
+            address=normalized.get("address"),
+            city=normalized.get("city"),
+            zip_code=normalized.get("zip_code"),
+            county=normalized.get("county"),
+            latitude=normalized.get("latitude"),
+            longitude=normalized.get("longitude"),
+            phone=normalized.get("phone"),
+            email=normalized.get("email"),
+            website=normalized.get("website"),
+            record_date=normalized.get("record_date"),
+            license_date=normalized.get("license_date"),
+            expiry_date=normalized.get("expiry_date"),
+            record_data=raw_record,
+            record_hash=record_hash,
+        ))
+    return records
+
+
 def _flush_batch(
     batch: List[RawRecord],
     run_id: int,
     source_id: int,
     log: logging.Logger,
+    checkpoint: Optional[dict] = None,
 ) -> int:
-    """Persist a batch of records. Returns count of stored records."""
+    """
+    Persist a batch of records. Returns count of stored records.
+    The collector checkpoint after the batch is saved on the run in the
+    same transaction, so a resumed run never stores a row twice, along
+    with a heartbeat that tells a live run from an abandoned one.
+    """
     if not batch:
         return 0
 
     stored = 0
     with session_scope() as session:
+        run = session.get(CollectionRun, run_id)
+        if run is not None:
+            updates = {"heartbeat": datetime.utcnow().isoformat()}
+            if checkpoint:
+                updates["checkpoint"] = checkpoint
+            run.details = {**(run.details or {}), **updates}
         for record in batch:
             # Optional: skip duplicates by hash
             # existing = session.query(RawRecord).filter_by(
@@ -0,0 +1,172 @@
+"""
+Staged pipeline for collection runs.
+
+run_collection_job fetches, normalizes and writes record batches on
+separate threads so page downloads overlap database commits:
+
+    fetch thread --queue--> transform thread --queue--> writer (job thread)
+
+Each queue holds at most ``depth`` batches, so a slow stage holds back the
+stages before it instead of buffering the whole source in memory. An
+exception in any stage is passed down the queues and re-raised by the
+consumer; closing the pipeline stops every stage and joins its thread.
+
+Every stage records its busy time (producing or consuming items) and its
+idle time (blocked on an empty inbox or a full outbox). A run is bounded by
+the stage with the most busy time, not by the sum of all of them.
+"""
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+_DONE = object()
+_POLL_SECONDS = 0.2  # How often a blocked stage checks whether the pipeline stopped
+
+
+class _Failed:
+    """Carries a stage's exception to the consumer."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class StageTiming:
+    """Busy and idle seconds of one pipeline stage."""
+
+    def __init__(self):
+        self.busy = 0.0
+        self.idle = 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {"busy_seconds": round(self.busy, 3), "idle_seconds": round(self.idle, 3)}
+
+
+class Pipeline:
+    """
+    Chain of stages connected by bounded queues.
+
+        pipeline = Pipeline(depth=4)
+        pipeline.source("fetch", batches)
+        pipeline.stage("transform", lambda batches: (f(b) for b in batches))
+        try:
+            for item in pipeline.results("write"):
+                ...
+        finally:
+            pipeline.close()
+    """
+
+    def __init__(self, depth: int = 4):
+        self.depth = max(1, int(depth))
+        self.timings: Dict[str, StageTiming] = {}
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._outbox: Optional[queue.Queue] = None
+        self._started = time.monotonic()
+        self._wall: Optional[float] = None
+
+    def source(self, name: str, items: Iterable[Any]) -> None:
+        """Start the first stage: a thread that puts each of ``items`` on a queue."""
+        self._start(name, lambda inbox: items)
+
+    def stage(self, name: str, transform: Callable[[Iterator[Any]], Iterable[Any]]) -> None:
+        """Start a stage that maps the previous stage's items with ``transform(items)``."""
+        if self._outbox is None:
+            raise ValueError("Pipeline.stage() needs a source() first")
+        self._start(name, transform)
+
+    def results(self, name: str) -> Iterator[Any]:
+        """Iterate the last stage's items on the calling thread, timed as stage ``name``."""
+        timing = self.timings[name] = StageTiming()
+        start = time.monotonic()
+        try:
+            yield from self._drain(self._outbox, timing)
+        finally:
+            timing.busy = time.monotonic() - start - timing.idle
+
+    def close(self) -> None:
+        """Stop every stage and wait for its thread to finish."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        if self._wall is None:
+            self._wall = time.monotonic() - self._started
+
+    def report(self) -> Dict[str, Any]:
+        """Wall-clock seconds and per-stage busy/idle seconds, for run details."""
+        wall = self._wall if self._wall is not None else time.monotonic() - self._started
+        return {
+            "depth": self.depth,
+            "wall_seconds": round(wall, 3),
+            "stages": {name: timing.to_dict() for name, timing in self.timings.items()},
+        }
+
+    # ------------------------------------------------------------------
+
+    def _start(self, name: str, make_items: Callable[[Optional[Iterator[Any]]], Iterable[Any]]) -> None:
+        inbox = self._outbox
+        outbox: queue.Queue = queue.Queue(maxsize=self.depth)
+        timing = self.timings[name] = StageTiming()
+        thread = threading.Thread(
+            target=self._run_stage,
+            args=(make_items, inbox, outbox, timing),
+            name=f"pipeline-{name}",
+            daemon=True,
+        )
+        self._outbox = outbox
+        self._threads.append(thread)
+        thread.start()
+
+    def _run_stage(self, make_items, inbox, outbox, timing: StageTiming) -> None:
+        start = time.monotonic()
+        items = None
+        try:
+            items = iter(make_items(self._drain(inbox, timing) if inbox is not None else None))
+            for item in items:
+                if not self._put(outbox, item, timing):
+                    return
+            self._put(outbox, _DONE, timing)
+        except BaseException as e:
+            self._put(outbox, _Failed(e), timing)
+        finally:
+            # Release what the stage holds (collector stream, process pool)
+            # on the thread that ran it
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+            timing.busy = time.monotonic() - start - timing.idle
+
+    def _put(self, outbox: queue.Queue, item: Any, timing: StageTiming) -> bool:
+        """Put with backpressure; False if the pipeline stopped while waiting."""
+        start = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                try:
+                    outbox.put(item, timeout=_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            timing.idle += time.monotonic() - start
+
+    def _drain(self, inbox: queue.Queue, timing: StageTiming) -> Iterator[Any]:
+        """Yield items from ``inbox`` until the upstream stage finishes or fails."""
+        while True:
+            start = time.monotonic()
+            try:
+                while True:
+                    if self._stop.is_set():
+                        return
+                    try:
+                        item = inbox.get(timeout=_POLL_SECONDS)
+                        break
+                    except queue.Empty:
+                        continue
+            finally:
+                timing.idle += time.monotonic() - start
+            if item is _DONE:
+                return
+            if isinstance(item, _Failed):
+                raise item.error
+            yield item
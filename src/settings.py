@@ -0,0 +1,83 @@
+"""
+Global settings loader for config/settings.yaml.
+
+Values of the form ``${VAR}`` or ``${VAR:default}`` are expanded from the
+environment. The file is read once per process; use reload_settings() after
+editing it.
+"""
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, Optional
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SETTINGS_PATH = os.environ.get(
+    "SETTINGS_FILE", os.path.join(PROJECT_ROOT, "config", "settings.yaml")
+)
+
+_ENV_PATTERN = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)(?::([^}]*))?\}")
+
+_settings: Optional[Dict[str, Any]] = None
+_lock = threading.Lock()
+
+
+def load_settings(path: str = None) -> Dict[str, Any]:
+    """Read and env-expand a settings file. Missing or invalid files give {}."""
+    path = path or SETTINGS_PATH
+    try:
+        with open(path) as f:
+            data = yaml.safe_load(f) or {}
+    except FileNotFoundError:
+        logger.debug(f"Settings file not found: {path}")
+        return {}
+    except yaml.YAMLError as e:
+        logger.error(f"Invalid settings file {path}: {e}")
+        return {}
+    return _expand_env(data)
+
+
+def get_settings() -> Dict[str, Any]:
+    """Return the cached process-wide settings."""
+    global _settings
+    if _settings is None:
+        with _lock:
+            if _settings is None:
+                _settings = load_settings()
+    return _settings
+
+
+def reload_settings() -> Dict[str, Any]:
+    """Drop the cached settings and read the file again."""
+    global _settings
+    with _lock:
+        _settings = load_settings()
+    return _settings
+
+
+def get_setting(key_path: str, default=None):
+    """
+    Get a setting by dot path, e.g. ``get_setting("rate_limiting.burst_allowance")``.
+    """
+    current: Any = get_settings()
+    for key in key_path.split("."):
+        if not isinstance(current, dict) or key not in current:
+            return default
+        current = current[key]
+    return default if current is None else current
+
+
+def _expand_env(value):
+    if isinstance(value, dict):
+        return {k: _expand_env(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_expand_env(v) for v in value]
+    if isinstance(value, str) and "${" in value:
+        return _ENV_PATTERN.sub(
+            lambda m: os.environ.get(m.group(1), m.group(2) or ""), value
+        )
+    return value
@@ -7,7 +7,7 @@
 from pathlib import Path
 from typing import Generator
 
-from sqlalchemy import create_engine, event, text
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 
@@ -87,10 +87,34 @@ def init_db(database_url: str = None, echo: bool = False, drop_all: bool = False
         Base.metadata.drop_all(_engine)
 
     Base.metadata.create_all(_engine)
+    _add_missing_columns(_engine)
     _SessionFactory = sessionmaker(bind=_engine, expire_on_commit=False)
     logger.info(f"Database initialized: {database_url or get_database_url()}")
 
 
+def _add_missing_columns(engine) -> None:
+    """
+    Add nullable model columns that are missing from existing tables.
+    create_all() only creates new tables, so databases created by an older
+    release would otherwise fail on newly added optional columns.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present or not column.nullable:
+                continue
+            col_type = column.type.compile(dialect=engine.dialect)
+            with engine.begin() as conn:
+                conn.execute(text(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"
+                ))
+            logger.info(f"Added column {table.name}.{column.name}")
+
+
 def get_engine():
     """Get the global database engine."""
     global _engine
@@ -30,7 +30,7 @@ class DataSource(Base):
     agency = Column(String(255), nullable=True)
     category = Column(String(50), nullable=False, index=True)
     subcategory = Column(String(50), nullable=True)
-    format = Column(String(20), nullable=False)      # soda, json, csv, geojson, xml
+    format = Column(String(20), nullable=False)      # soda, json, csv, geojson, xml, jsonl, zip, xlsx
     url = Column(String(2048), nullable=True)
     discovery_url = Column(String(2048), nullable=True)
     website = Column(String(2048), nullable=True)
@@ -41,6 +41,7 @@ class DataSource(Base):
     headers = Column(JSON, nullable=True)            # Custom headers
     pagination = Column(JSON, nullable=True)         # Pagination config
     field_mapping = Column(JSON, nullable=True)      # Field name mapping
+    options = Column(JSON, nullable=True)            # Collection mode options
     tags = Column(JSON, nullable=True)               # List of tags
     notes = Column(Text, nullable=True)
     rate_limit_rpm = Column(Integer, default=60)     # Requests per minute
@@ -52,6 +53,7 @@ class DataSource(Base):
     schedules = relationship("CollectionSchedule", back_populates="source", cascade="all, delete-orphan")
     runs = relationship("CollectionRun", back_populates="source", cascade="all, delete-orphan")
     records = relationship("RawRecord", back_populates="source", cascade="all, delete-orphan")
+    http_validators = relationship("HttpValidator", cascade="all, delete-orphan")
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -74,6 +76,7 @@ def to_dict(self) -> Dict[str, Any]:
             "headers": self.headers,
             "pagination": self.pagination,
             "field_mapping": self.field_mapping,
+            "options": self.options,
             "tags": self.tags,
             "notes": self.notes,
             "rate_limit_rpm": self.rate_limit_rpm,
@@ -158,7 +161,7 @@ class CollectionRun(Base):
     schedule_id = Column(Integer, ForeignKey("collection_schedules.id"), nullable=True)
     started_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     completed_at = Column(DateTime, nullable=True)
-    status = Column(String(20), nullable=False, index=True)  # running, success, failed, partial
+    status = Column(String(20), nullable=False, index=True)  # running, success, failed, partial, unchanged
     records_fetched = Column(Integer, default=0)
     records_stored = Column(Integer, default=0)
     records_updated = Column(Integer, default=0)
@@ -167,6 +170,7 @@ class CollectionRun(Base):
     raw_file_path = Column(String(512), nullable=True)
     duration_seconds = Column(Float, nullable=True)
     triggered_by = Column(String(50), default="scheduler")  # scheduler, manual, api
+    details = Column(JSON, nullable=True)            # Collector state: watermarks, etc.
 
     # Relationships
     source = relationship("DataSource", back_populates="runs")
@@ -192,8 +196,10 @@ def to_dict(self) -> Dict[str, Any]:
             "records_updated": self.records_updated,
             "records_skipped": self.records_skipped,
             "error_message": self.error_message,
+            "raw_file_path": self.raw_file_path,
             "duration_seconds": self.duration,
             "triggered_by": self.triggered_by,
+            "details": self.details,
         }
 
     def __repr__(self):
@@ -347,6 +353,40 @@ def __repr__(self):
         return f"<CollectionLog {self.level}: {self.message[:50]}>"
 
 
+class HttpValidator(Base):
+    """
+    HTTP cache validators (ETag / Last-Modified) last seen for a source URL.
+    Sent back as If-None-Match / If-Modified-Since so unchanged whole-file
+    downloads can be skipped with a 304.
+    """
+    __tablename__ = "http_validators"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    source_id = Column(Integer, ForeignKey("data_sources.id"), nullable=False, index=True)
+    url = Column(String(2048), nullable=False)
+    url_hash = Column(String(64), nullable=False)
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(64), nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("source_id", "url_hash", name="uq_http_validator_source_url"),
+    )
+
+    @staticmethod
+    def hash_url(url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+        }
+
+    def __repr__(self):
+        return f"<HttpValidator source={self.source_id} {self.url[:60]}>"
+
+
 class AppSetting(Base):
     """
     Key-value store for application settings editable via the dashboard.
@@ -0,0 +1,165 @@
+"""
+Differential tests: RecordNormalizer.normalize_batch must return exactly
+what normalize() returns record by record, with and without NumPy.
+"""
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from src.processors import normalizer as normalizer_module
+from src.processors.normalizer import RecordNormalizer
+
+
+def _source(**overrides):
+    source = dict(
+        source_id="test_source", state="CO", category="dispensary",
+        subcategory=None, field_mapping={}, options={},
+    )
+    source.update(overrides)
+    return SimpleNamespace(**source)
+
+
+@pytest.fixture(params=["numpy", "no_numpy"])
+def numpy_mode(request, monkeypatch):
+    if request.param == "numpy":
+        if normalizer_module.np is None:
+            pytest.skip("NumPy is not installed")
+    else:
+        monkeypatch.setattr(normalizer_module, "np", None)
+    return request.param
+
+
+def _assert_same(records, source=None):
+    source = source or _source()
+    batch = RecordNormalizer(source).normalize_batch([dict(r) for r in records])
+
+    scalar_normalizer = RecordNormalizer(source)
+    scalar_normalizer.learn_date_formats(records)
+    scalar = [scalar_normalizer.normalize(dict(r)) for r in records]
+
+    assert len(batch) == len(scalar)
+    for i, (b, s) in enumerate(zip(batch, scalar)):
+        assert b == s, f"record {i}: {records[i]!r}"
+        # Same types, not just equal values (1 == 1.0, True == 1)
+        assert {k: type(v) for k, v in b.items()} == {k: type(v) for k, v in s.items()}
+
+
+COORDINATES = [
+    None, "", " ", "39.7392", "-104.9903", 39.7392, -104.99, 0, "0", 0.0,
+    "91", "-90", "90.0001", "180", "-180.5", 500, "abc", "N/A", "1e2",
+    "nan", "inf", "-inf", " 39.5 ", True, "39,7",
+]
+ZIPS = [None, "", "80202", "80202-1234", " 80202 ", "8020", "802", "80202 1234",
+        80202, 8020, "CO 80202", "no zip", "00501", "8\x0002"]
+PHONES = [None, "", "3035551234", "(303) 555-1234", "303.555.1234", "1-303-555-1234",
+          "+1 (303) 555 1234", "555-1234", 3035551234, "ext. 12", "303-555-1234 x55",
+          "13035551234", "23035551234"]
+DATES = [None, "", "n/a", "NULL", "2021-03-04", "2021-3-4", "2021-03-04T00:00:00",
+         "2021-03-04 10:00:00", "03/04/2021", "31/12/2020", "12/31/2020", "03-04-2021",
+         "2021/03/04", "03/04/21", "04-Mar-2021", "2021-02-30", "not a date", "13/13/2020"]
+STATES = [None, "", "co", "CO ", "Colorado", "colorado", "New York", "Narnia", "wa"]
+WEBSITES = [None, "", "example.com", "http://example.com", "https://x.org", " www.x.org ", 42]
+
+
+def _random_record(rng):
+    record = {"name": rng.choice(["Green Leaf", " Green Leaf ", "", None, "N/A", 12])}
+    for key, values in (
+        ("latitude", COORDINATES), ("longitude", COORDINATES), ("zip", ZIPS),
+        ("phone", PHONES), ("license_date", DATES), ("expiry_date", DATES),
+        ("state", STATES), ("website", WEBSITES),
+    ):
+        if rng.random() < 0.8:  # Leave some keys out entirely
+            record[key] = rng.choice(values)
+    if rng.random() < 0.2:
+        record["location"] = {
+            "latitude": rng.choice(COORDINATES), "longitude": rng.choice(COORDINATES),
+        }
+    return record
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_records(numpy_mode, seed):
+    rng = random.Random(seed)
+    _assert_same([_random_record(rng) for _ in range(rng.randint(1, 300))])
+
+
+def test_coordinate_edge_cases(numpy_mode):
+    records = [{"latitude": lat, "longitude": lon} for lat in COORDINATES for lon in COORDINATES]
+    _assert_same(records)
+
+
+def test_nested_location_columns(numpy_mode):
+    records = [
+        {"location": {"latitude": "39.7", "longitude": "-104.9"}},
+        {"location": {"lat": "39.7", "lng": "-104.9"}},
+        {"geolocation": {"latitude": 0, "longitude": 0}},
+        {"geolocation": {"latitude": "abc", "longitude": "-104.9"}},
+        {"coordinates": {"lat": 95, "lon": 10}},
+        {"location": {"human_address": "{}"}},
+        {"location": "39.7,-104.9"},
+        {"latitude": "39.7", "location": {"longitude": "-104.9"}},
+    ]
+    _assert_same(records)
+
+
+def test_all_coordinates_valid_or_missing(numpy_mode):
+    # Exercises the whole-column np.fromiter path without a bad value
+    _assert_same([{"latitude": "39.1", "longitude": "-105"}, {}, {"latitude": None}] * 50)
+
+
+def test_zip_and_phone_punctuation(numpy_mode):
+    _assert_same([{"zip": z, "phone": p} for z in ZIPS for p in PHONES])
+
+
+def test_mixed_date_formats(numpy_mode):
+    _assert_same([{"license_date": d, "record_date": d} for d in DATES] * 3)
+
+
+def test_day_first_dates(numpy_mode):
+    records = [{"license_date": f"{day:02d}/{month:02d}/2020"}
+               for day in range(1, 29) for month in (1, 6, 12)]
+    _assert_same(records)
+
+
+def test_missing_keys_and_empty_records(numpy_mode):
+    _assert_same([{}, {"unrelated": 1}, {"name": None}, {"zip": None, "phone": ""}])
+
+
+def test_field_mapping_and_nested_paths(numpy_mode):
+    source = _source(
+        field_mapping={
+            "name": "business.name", "zip_code": "addr.postal", "phone": "contact.0",
+            "latitude": "geo.y", "longitude": "geo.x", "license_date": "issued",
+        },
+        options={"date_formats": {"license_date": "%d/%m/%Y"}},
+    )
+    rng = random.Random(7)
+    records = [
+        {
+            "business": {"name": rng.choice(["A", "", None])},
+            "addr": {"postal": rng.choice(ZIPS)},
+            "contact": [rng.choice(PHONES)],
+            "geo": {"y": rng.choice(COORDINATES), "x": rng.choice(COORDINATES)},
+            "issued": rng.choice(DATES),
+        }
+        for _ in range(200)
+    ]
+    _assert_same(records, source)
+
+
+def test_batches_after_learning_match_scalar(numpy_mode):
+    rng = random.Random(3)
+    records = [_random_record(rng) for _ in range(600)]
+    batch_normalizer = RecordNormalizer(_source())
+    batched = []
+    for start in range(0, len(records), 100):
+        batched.extend(batch_normalizer.normalize_batch([dict(r) for r in records[start:start + 100]]))
+
+    scalar_normalizer = RecordNormalizer(_source())
+    scalar_normalizer.learn_date_formats(records[:100])
+    assert batched == [scalar_normalizer.normalize(dict(r)) for r in records]
+
+
+def test_empty_batch():
+    assert RecordNormalizer(_source()).normalize_batch([]) == []
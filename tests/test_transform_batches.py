@@ -0,0 +1,60 @@
+"""
+The process-pool path of run_collection_job's transform stage must build
+exactly the rows the serial path builds, and report the same date formats.
+"""
+import random
+
+from src.processors.normalizer import RecordNormalizer
+from src.scheduler.manager import _SourceProxy, _transform_batches
+from src.storage.models import RawRecord
+
+SOURCE = {
+    "id": 1, "source_id": "test_source", "state": "CO", "category": "dispensary",
+    "subcategory": None, "field_mapping": {}, "options": {},
+}
+DATES = [None, "", "n/a", "2021-03-04", "03/04/2021", "31/12/2020", "12/31/2020",
+         "04-Mar-2021", "not a date"]
+
+
+def _records(count, seed):
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        record = {
+            "name": rng.choice(["Green Leaf", " Green Leaf ", "", None]),
+            "license_number": f"L{i}",
+            "zip": rng.choice(["80202", "80202-1234", "8020", None]),
+            "latitude": rng.choice(["39.7", "91", None]),
+            "license_date": f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2020",
+        }
+        if i >= 120:  # A date field that only appears after the first batch
+            record["expiry_date"] = rng.choice(DATES)
+        records.append(record)
+    return records
+
+
+def _run(records, workers, batch_size=50):
+    normalizer = RecordNormalizer(_SourceProxy(SOURCE))
+    batches = [
+        (records[start:start + batch_size], {"offset": start + batch_size})
+        for start in range(0, len(records), batch_size)
+    ]
+    rows = []
+    checkpoints = []
+    for _, checkpoint, built in _transform_batches(batches, normalizer, workers, 7, SOURCE):
+        checkpoints.append(checkpoint)
+        rows.extend(
+            {column.name: getattr(row, column.name) for column in RawRecord.__table__.columns}
+            for row in built
+        )
+    return rows, checkpoints, normalizer.date_format_report()
+
+
+def test_pool_matches_serial():
+    records = _records(400, seed=5)
+    serial = _run(records, workers=1)
+    pooled = _run(records, workers=2)
+    assert pooled[1] == serial[1]
+    assert pooled[0] == serial[0]
+    assert pooled[2] == serial[2]
+    assert set(serial[2]) == {"license_date", "expiry_date"}